@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Uçtan uca tarama benchmark'ı (ağ gerektirmez)
+
+Her kayıt (bench/recordings/<ad>/) yerel ReplayServer'dan sunulur ve kanal, adresleri
+sunucuya çevrilmiş olarak `python -m scraper` ile iki kez taranır:
+  - soğuk: boş önbellek
+  - sıcak: ilk çalıştırmanın önbelleğiyle (ETag'siz kayıtlarda yalnızca ReferenceId/media önbelleği)
+Her çalıştırma ayrı süreçte yapılır; süre, istek sayısı ve aşama süreleri çalıştırmanın
+JSON raporundan (scraper.telemetry) okunur. Kayıt yoksa fixture'lardan sentetik kayıt üretilir.
+
+Kullanım:
+  python bench/crawl_bench.py
+  python bench/crawl_bench.py synthetic-dmax --latency 0.05 --jitter 0.03 --error-rate 0.02
+  python bench/crawl_bench.py dmax -- --workers 16 --rate 0     # "--" sonrası scraper'a gider
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import dataclasses
+from pathlib import Path
+from typing import List, Dict, Any
+
+BENCH = Path(__file__).resolve().parent
+ROOT = BENCH.parent
+RECORDINGS = BENCH / "recordings"
+
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(BENCH))
+
+from mock_site import ReplayServer, synthesize  # noqa: E402
+
+def child(config: Dict[str, Any]) -> None:
+    """Alt süreç: kanalı sunucuya yönlendirip scraper'ı çalıştırır."""
+    from scraper import cli
+    from scraper.channels import CHANNELS
+
+    name = config["channel"]
+    CHANNELS[name] = dataclasses.replace(
+        CHANNELS[name],
+        base_url=config["base_url"] + "/",
+        output_dir=config["output_dir"],
+        series_urls=tuple(config["series_urls"]),
+        series_file="",
+    )
+    cli.main([name, "--cache-dir", config["cache_dir"], "--report", config["report"], *config["scraper_args"]])
+
+def run_once(server: ReplayServer, tmp: Path, label: str, scraper_args: List[str]) -> Dict[str, Any]:
+    config = {
+        "channel": server.meta["channel"],
+        "base_url": server.base_url,
+        "output_dir": str(tmp / "out"),
+        "cache_dir": str(tmp / "cache"),
+        "report": str(tmp / f"{label}.json"),
+        "series_urls": [server.rewrite(url) for url in server.meta.get("series_urls", [])],
+        "scraper_args": scraper_args,
+    }
+    before = dict(server.stats)
+    started = time.perf_counter()
+    subprocess.run([sys.executable, __file__, "--child", json.dumps(config)], check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=dict(os.environ, TQDM_DISABLE="1"))
+    elapsed = time.perf_counter() - started
+    report = json.loads(Path(config["report"]).read_text(encoding="utf-8"))
+    return {
+        "label": label,
+        "wall": elapsed,
+        "server": {key: server.stats[key] - before[key] for key in server.stats},
+        "report": report,
+    }
+
+def print_result(name: str, result: Dict[str, Any]) -> None:
+    report = result["report"]
+    stages = report["stages"]
+    requests_total = sum(stage["requests"] for stage in stages.values())
+    mb_total = sum(stage["bytes"] for stage in stages.values()) / 1e6
+    channels = ", ".join(f"{key}: {value.get('programs', 0)} program / {value.get('episodes', 0)} bölüm"
+                         for key, value in report["channels"].items())
+    print(f"{name:<22} {result['label']:<6} {result['wall']:7.2f} sn  {requests_total:6d} istek  "
+          f"{mb_total:7.2f} MB  sunucu: {result['server']['requests']} istek, "
+          f"{result['server']['errors']} enjekte hata, {result['server']['misses']} kayıtsız  ({channels})")
+    for stage_name, stage in sorted(stages.items(), key=lambda item: -item[1]["seconds"]):
+        print(f"    {stage_name:<16} {stage['calls']:6d} çağrı {stage['seconds']:8.2f} sn "
+              f"{stage['requests']:6d} istek  ort. {stage['latency_avg'] * 1000:6.1f} ms  "
+              f"ayrıştırma {stage['parse_seconds']:6.2f} sn")
+
+def main() -> None:
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        child(json.loads(sys.argv[2]))
+        return
+
+    argv = sys.argv[1:]
+    scraper_args: List[str] = []
+    if "--" in argv:
+        index = argv.index("--")
+        argv, scraper_args = argv[:index], argv[index + 1:]
+
+    parser = argparse.ArgumentParser(description="Kayıtlı yanıtlarla uçtan uca tarama benchmark'ı")
+    parser.add_argument("recordings", nargs="*", help="bench/recordings altındaki kayıt adları (boşsa hepsi)")
+    parser.add_argument("--latency", type=float, default=0.02, help="yanıt başına sabit gecikme (sn)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="gecikmeye eklenen rastgele sapma üst sınırı (sn)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429/503 döndürülecek istek oranı (0-1)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="sonuçları bu dosyaya da yaz")
+    args = parser.parse_args(argv)
+
+    folders = [RECORDINGS / name for name in args.recordings]
+    if not folders:
+        folders = sorted(p.parent for p in RECORDINGS.glob("*/meta.json")) or synthesize(RECORDINGS)
+
+    results = []
+    for folder in folders:
+        server = ReplayServer(folder, latency=args.latency, jitter=args.jitter,
+                              error_rate=args.error_rate, seed=args.seed).start()
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                for label in ("soğuk", "sıcak"):
+                    result = run_once(server, Path(tmp), label, scraper_args)
+                    print_result(folder.name, result)
+                    results.append(dict(result, recording=folder.name))
+        finally:
+            server.stop()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, ensure_ascii=False, indent=1), encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
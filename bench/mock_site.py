@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+"""
+Çevrimdışı benchmark için site yerine geçen yerel HTTP sunucusu ve kayıt biçimi
+
+Kayıt klasörü (bench/recordings/<ad>/):
+  meta.json       → {"channel": "dmax", "origins": ["https://www.dmax.com.tr"],
+                     "series_urls": [...] (Kanal D), ...}
+  responses.jsonl → satır başına bir yanıt:
+                    {"method", "url", "data" (form alanları | null), "status", "headers", "body"}
+
+ReplayServer kayıtları (yöntem, yol+sorgu, form alanları) anahtarıyla sunar; gövdelerdeki
+ve Location başlıklarındaki kayıtlı origin'leri kendi adresiyle değiştirir. Gecikme
+(sabit + rastgele sapma) ve hata enjeksiyonu (429/503, Retry-After ile) ayarlanabilir;
+rastgelelik tohumludur, aynı ayarlar aynı hata dizisini üretir.
+
+synthesize() ağ olmadan bench/fixtures şablonlarından (gerçek sayfa işaretlemesi)
+DMAX benzeri bir katalog ve Kanal D benzeri diziler üretir.
+"""
+
+import re
+import json
+import time
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import List, Tuple, Dict, Any, Optional, Sequence
+from urllib.parse import urlsplit, parse_qsl
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+META_NAME = "meta.json"
+RESPONSES_NAME = "responses.jsonl"
+
+Key = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+def make_key(method: str, path: str, data: Optional[Dict[str, Any]]) -> Key:
+    fields = tuple(sorted((str(k), str(v)) for k, v in (data or {}).items()))
+    return method.upper(), path, fields
+
+def _path_of(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + ("?" + parts.query if parts.query else "")
+
+def write_recording(folder: Path, channel: str, origins: List[str], entries: List[Dict[str, Any]],
+                    series_urls: Sequence[str] = ()) -> None:
+    folder.mkdir(parents=True, exist_ok=True)
+    meta = {"channel": channel, "origins": sorted(set(origins)), "created": int(time.time()),
+            "responses": len(entries), "series_urls": list(series_urls)}
+    (folder / META_NAME).write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+    with open(folder / RESPONSES_NAME, "w", encoding="utf-8", newline="\n") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+def load_recording(folder: Path) -> Tuple[Dict[str, Any], Dict[Key, Dict[str, Any]]]:
+    meta = json.loads((folder / META_NAME).read_text(encoding="utf-8"))
+    responses: Dict[Key, Dict[str, Any]] = {}
+    with open(folder / RESPONSES_NAME, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            responses[make_key(entry["method"], _path_of(entry["url"]), entry.get("data"))] = entry
+    return meta, responses
+
+class ReplayServer:
+    """Kayıtlı yanıtları sunan ThreadingHTTPServer (arka plan iş parçacığında)."""
+
+    def __init__(self, folder: Path, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 1, port: int = 0) -> None:
+        self.meta, self.responses = load_recording(folder)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "misses": 0, "errors": 0}
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def rewrite(self, text: str) -> str:
+        for origin in self.meta["origins"]:
+            text = text.replace(origin, self.base_url)
+        return text
+
+    def _draw(self) -> Tuple[float, bool]:
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.stats["errors"] += 1
+            return delay, failed
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _reply(self, status: int, headers: Dict[str, str], body: bytes) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _serve(self, data: Optional[Dict[str, str]]) -> None:
+                delay, failed = server._draw()
+                time.sleep(delay)
+                if failed:
+                    status = server._random.choice((429, 503))
+                    return self._reply(status, {"Retry-After": "1"}, b"")
+                entry = server.responses.get(make_key(self.command, self.path, data))
+                if entry is None and self.command == "HEAD":
+                    entry = server.responses.get(make_key("GET", self.path, data))
+                if entry is None:
+                    with server._lock:
+                        server.stats["misses"] += 1
+                    return self._reply(404, {}, b"not recorded")
+                headers = {name: server.rewrite(value) for name, value in (entry.get("headers") or {}).items()}
+                self._reply(entry["status"], headers, server.rewrite(entry.get("body") or "").encode("utf-8"))
+
+            def do_GET(self) -> None:
+                self._serve(None)
+
+            def do_HEAD(self) -> None:
+                self._serve(None)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8")
+                self._serve(dict(parse_qsl(body, keep_blank_values=True)))
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+# ============================
+# Sentetik kayıt (ağsız, fixture şablonlarından)
+# ============================
+
+DMAX_ORIGIN = "https://www.dmax.com.tr"
+KANALD_ORIGIN = "https://www.kanald.com.tr"
+HTML = {"Content-Type": "text/html; charset=utf-8"}
+JSON = {"Content-Type": "application/json; charset=utf-8"}
+
+def _first_line(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8").splitlines()[0]
+
+def synthesize_discovery(programs: int = 60, discover_page: int = 48,
+                         episode_page: int = 12, seed: int = 1) -> List[Dict[str, Any]]:
+    """DMAX benzeri katalog: A-Z sayfaları, program sayfaları, sezon sayfaları, oynatıcı sayfaları."""
+    rnd = random.Random(seed)
+    ajax_url = f"{DMAX_ORIGIN}/ajax/more"
+    poster = _first_line("discover.html")
+    item = _first_line("episodes.html")
+    program_html = (FIXTURES / "program.html").read_text(encoding="utf-8")
+    player_html = (FIXTURES / "episode.html").read_text(encoding="utf-8")
+    entries: List[Dict[str, Any]] = []
+
+    def post(data: Dict[str, Any], body: str) -> None:
+        entries.append({"method": "POST", "url": ajax_url, "data": {k: str(v) for k, v in data.items()},
+                        "status": 200, "headers": HTML, "body": body})
+
+    def get(url: str, body: str) -> None:
+        entries.append({"method": "GET", "url": url, "data": None, "status": 200, "headers": HTML, "body": body})
+
+    slugs = [f"program-{i:03d}" for i in range(programs)]
+    for page in range((programs + discover_page - 1) // discover_page + 1):
+        chunk = slugs[page * discover_page:(page + 1) * discover_page]
+        body = "\n".join(
+            re.sub(r"'[^']*'\);", f"'PROGRAM {slug[-3:]}');",
+                   poster.replace("/antik-muhendislik", f"/{slug}"), count=1)
+            for slug in chunk
+        )
+        post({"type": "discover", "slug": "a-z", "page": page}, body)
+
+    def episode_items(season: str, urls: List[str]) -> str:
+        return "\n".join(
+            re.sub(r"<strong>[^<]*</strong>", f"<strong>{season}. Sezon {url.rsplit('-', 1)[1]}. Bölüm</strong>",
+                   re.sub(r'href="[^"]*"', f'href="{url}"', item, count=1), count=1)
+            for url in urls
+        )
+
+    # Fixture'daki gömülü bölümler (section.episodes) başka bir programa ait; her program
+    # sayfasına kendi en yeni sezonunun ilk sayfası konur, yoksa tarayıcı onları yoklar.
+    program_html = re.sub(r'<div class="item[^"]*">.*?</a></div>', "", program_html, flags=re.S)
+
+    for number, slug in enumerate(slugs, 1):
+        seasons = [str(s) for s in range(1, rnd.randint(1, 4) + 1)]
+        episode_urls = {season: [f"{DMAX_ORIGIN}/{slug}/sezon-{season}/bolum-{k}" for k in range(count, 0, -1)]
+                        for season, count in ((season, rnd.randint(3, 30)) for season in seasons)}
+        options = "".join(f'<option value="{s}">{s}. Sezon</option>' for s in reversed(seasons))
+        page_html = re.sub(r'data-program-id="\d+"', f'data-program-id="{number}"', program_html)
+        page_html = re.sub(r'(<select class="custom-dropdown"[^>]*>).*?(</select>)', rf"\g<1>{options}\g<2>",
+                           page_html, count=1, flags=re.S)
+        head, sep, tail = page_html.partition('<section class="episodes"')
+        newest = seasons[-1]
+        page_html = head + sep + tail.replace("</section>",
+                                              episode_items(newest, episode_urls[newest][:episode_page]) + "</section>", 1)
+        get(f"{DMAX_ORIGIN}/{slug}", page_html)
+
+        for season in seasons:
+            urls = episode_urls[season]
+            for page in range(len(urls) // episode_page + 1):
+                post({"type": "episodes", "program_id": number, "page": page, "season": season},
+                     episode_items(season, urls[page * episode_page:(page + 1) * episode_page]))
+            for url in urls:
+                code = f"EHD_{number:03d}{season}{url.rsplit('-', 1)[1]:0>3}"
+                get(url, player_html.replace('data-video-code="EHD_295668"', f'data-video-code="{code}"'))
+    return entries
+
+def synthesize_kanald(series: int = 3, page_size: int = 12, seed: int = 1) -> List[Dict[str, Any]]:
+    """Kanal D benzeri diziler: dizi sayfası, bolumler?p=N sayfaları, actions/media yanıtları."""
+    rnd = random.Random(seed)
+    entries: List[Dict[str, Any]] = []
+    for number in range(1, series + 1):
+        url = f"{KANALD_ORIGIN}/dizi-{number}"
+        entries.append({"method": "GET", "url": url, "data": None, "status": 200, "headers": HTML,
+                        "body": f'<html><body><h1 class="title">Dizi {number}</h1><div class="poster">'
+                                f'<img class="desktop-poster" data-src="/img/dizi-{number}.jpg"></div></body></html>'})
+        total = rnd.randint(20, 120)
+        for page in range(1, total // page_size + 3):
+            items = range((page - 1) * page_size, min(total, page * page_size))
+            body = "".join(
+                f'<div class="episode-item"><a href="{url}/bolumler/{k + 1}" data-media-id="{number}{k:04d}">'
+                f'<span class="title">{k + 1}. Bölüm</span>'
+                f'<img class="desktop-poster" src="/img/dizi-{number}-{k}.jpg"></a></div>'
+                for k in items
+            )
+            entries.append({"method": "GET", "url": f"{url}/bolumler?p={page}", "data": None, "status": 200,
+                            "headers": HTML, "body": f"<html><body>{body}</body></html>"})
+            for k in items:
+                media = {"status": "success", "media": {"files": [
+                    {"type": "video/mp4", "url": f"https://vod.example/{number}/{k}.mp4"},
+                    {"type": "application/x-mpegURL", "url": f"https://vod.example/{number}/{k}/index.m3u8"},
+                ]}}
+                entries.append({"method": "POST", "url": f"{KANALD_ORIGIN}/actions/media",
+                                "data": {"id": f"{number}{k:04d}"}, "status": 200, "headers": JSON,
+                                "body": json.dumps(media)})
+    return entries
+
+def synthesize(folder: Path) -> List[Path]:
+    """bench/recordings altına synthetic-dmax ve synthetic-kanald kayıtlarını yazar."""
+    dmax = folder / "synthetic-dmax"
+    write_recording(dmax, "dmax", [DMAX_ORIGIN], synthesize_discovery())
+    kanald = folder / "synthetic-kanald"
+    entries = synthesize_kanald()
+    series_urls = [entry["url"] for entry in entries if entry["url"].rsplit("/", 1)[1].startswith("dizi-")]
+    write_recording(kanald, "kanald", [KANALD_ORIGIN], entries, series_urls=series_urls)
+    return [dmax, kanald]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTML ayrıştırma mikro-benchmark'ı (kayıtlı fixture'lar üzerinde, ağ gerektirmez)
+
+Her sayfa türü için eski yol (tam DOM, html.parser) ile yeni yol (HTML_PARSER,
+tam sayfalarda SoupStrainer, oynatıcı sayfasında data-video-code ön taraması)
+karşılaştırılır; ikisinin aynı veriyi çıkardığı da doğrulanır.
+
+Kullanım:
+  python bench/parse_bench.py
+  python bench/parse_bench.py 500
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+sys.path.insert(0, str(ROOT))
+
+from scraper import discovery, net  # noqa: E402
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) >= 2 else 200
+
+    def old_posters(content):
+        soup = BeautifulSoup(content, "html.parser")
+        return [p.find("a").get("href") for p in soup.find_all("div", {"class": "poster"})]
+
+    def new_posters(content):
+        soup = net.make_soup(content)
+        return [p.find("a").get("href") for p in soup.find_all("div", {"class": "poster"})]
+
+    def old_program(content):
+        soup = BeautifulSoup(content, "html.parser")
+        select = soup.find("select", {"class": "custom-dropdown"})
+        return (soup.find("a", {"class": "dyn-link"}).get("data-program-id"),
+                [o.get("value") for o in select.find_all("option")])
+
+    def new_program(content):
+        soup = net.make_soup(content, discovery.PROGRAM_PAGE_STRAINER)
+        select = soup.find("select", {"class": "custom-dropdown"})
+        return (soup.find("a", {"class": "dyn-link"}).get("data-program-id"),
+                [o.get("value") for o in select.find_all("option")])
+
+    def old_items(content):
+        soup = BeautifulSoup(content, "html.parser")
+        return [(it.find("strong").get_text().strip(), it.find("a").get("href"))
+                for it in soup.find_all("div", {"class": "item"})]
+
+    def new_items(content):
+        soup = net.make_soup(content)
+        return [(it.find("strong").get_text().strip(), it.find("a").get("href"))
+                for it in soup.find_all("div", {"class": "item"})]
+
+    def old_episode(content):
+        soup = BeautifulSoup(content, "html.parser")
+        return soup.find("div", {"class": "video-player"}).get("data-video-code")
+
+    def new_episode(content):
+        return discovery.scan_video_code(content)
+
+    cases = [
+        ("discover.html", old_posters, new_posters),
+        ("program.html", old_program, new_program),
+        ("episodes.html", old_items, new_items),
+        ("episode.html", old_episode, new_episode),
+    ]
+
+    print(f"ayrıştırıcı: {net.HTML_PARSER} | tekrar: {number}")
+    print(f"{'fixture':<16}{'boyut':>9}{'eski (ms)':>12}{'yeni (ms)':>12}{'hızlanma':>11}")
+    for name, old, new in cases:
+        content = (FIXTURES / name).read_bytes()
+        if old(content) != new(content):
+            raise SystemExit(f"{name}: eski ve yeni yol farklı sonuç verdi")
+        t_old = timeit.timeit(lambda: old(content), number=number) / number * 1000
+        t_new = timeit.timeit(lambda: new(content), number=number) / number * 1000
+        print(f"{name:<16}{len(content):>9}{t_old:>12.3f}{t_new:>12.3f}{t_old / t_new:>10.1f}x")
+
+if __name__ == "__main__":
+    main()
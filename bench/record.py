@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gerçek siteden benchmark kaydı alır (ağ gerekir, bir kez çalıştırılır)
+
+Kanal normal şekilde taranır; SESSION'dan geçen her yanıt (ajax/more, program ve
+oynatıcı sayfaları, Kanal D actions/media ...) bench/recordings/<ad>/ altına yazılır.
+Önbellekler geçici klasörde, M3U çıktıları da geçici klasörde tutulur; depodaki
+listeler değişmez. Kayıt crawl_bench.py ile ağsız yeniden oynatılır.
+
+Kullanım:
+  python bench/record.py dmax --end 5            # ilk 5 program
+  python bench/record.py kanald --name kanald-3
+"""
+
+import sys
+import argparse
+import tempfile
+import dataclasses
+from pathlib import Path
+from typing import List, Dict, Any
+from urllib.parse import urlsplit, parse_qsl
+
+ROOT = Path(__file__).resolve().parent.parent
+RECORDINGS = Path(__file__).resolve().parent / "recordings"
+
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_site import write_recording  # noqa: E402
+from scraper import cli, kanald  # noqa: E402
+from scraper.channels import CHANNELS  # noqa: E402
+from scraper.net import SESSION, log  # noqa: E402
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark için gerçek yanıtları kaydet")
+    parser.add_argument("channel", choices=sorted(CHANNELS))
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--end", type=int, default=3, help="bitiş program indeksi (0 = hepsi)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--name", help="kayıt adı (varsayılan: kanal adı)")
+    args = parser.parse_args()
+
+    entries: List[Dict[str, Any]] = []
+
+    def record(r, *hook_args: Any, **kwargs: Any) -> None:
+        body = r.request.body
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", "replace")
+        entries.append({
+            "method": r.request.method,
+            "url": r.url,
+            "data": dict(parse_qsl(body, keep_blank_values=True)) if body else None,
+            "status": r.status_code,
+            "headers": {name: r.headers[name] for name in ("Content-Type", "Location") if name in r.headers},
+            "body": "" if kwargs.get("stream") else r.text,
+        })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        channel = dataclasses.replace(CHANNELS[args.channel], output_dir=str(Path(tmp) / "out"))
+        CHANNELS[args.channel] = channel
+        SESSION.hooks["response"].append(record)
+        cli.main([args.channel, "--start", str(args.start), "--end", str(args.end),
+                  "--workers", str(args.workers), "--no-http-cache", "--full-refresh",
+                  "--cache-dir", str(Path(tmp) / "cache"), "--report", str(Path(tmp) / "report.json")])
+
+    origins = ["{0.scheme}://{0.netloc}".format(urlsplit(entry["url"])) for entry in entries]
+    series_urls = kanald.get_series_urls(channel)[args.start:args.end or None] if channel.kind == "kanald" else []
+    folder = RECORDINGS / (args.name or args.channel)
+    write_recording(folder, args.channel, origins, entries, series_urls=series_urls)
+    log.info("%d yanıt kaydedildi → %s", len(entries), folder)
+
+if __name__ == "__main__":
+    main()
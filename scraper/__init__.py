@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+"""
+Ortak kanal scraper paketi (DMAX, TLC, Kanal D)
+Tüm kanallar tek süreçte, tek bağlantı havuzu ve tek önbellekle çalışır:
+  python -m scraper [kanal ...]
+Kanallar scraper.channels.CHANNELS kayıt defterinde tanımlıdır.
+"""
+
+from .channels import CHANNELS, ChannelConfig
+from .cli import main
+
+__all__ = ["CHANNELS", "ChannelConfig", "main"]
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+"""
+Çalıştırmalar arası kalıcı önbellekler (tüm kanallar aynı .cache klasörünü paylaşır)
+- REFERENCE_CACHE → bölüm URL'si → ReferenceId (episodes.jsonl)
+- MEDIA_CACHE     → Kanal D media ID → stream URL (media.jsonl)
+- PAGINATION      → ajax/more sayfa boyutları ve sayfa sayıları (pages.json)
+- SEASONS         → eski (tamamlanmış) sezonların bölüm listeleri ve ilk sayfa parmak izi (seasons.json)
+- SEED            → diskteki son M3U listelerinden son bilinen bölüm durumu (önbellek kaybolduğunda)
+- CheckpointJournal → kanal başına tamamlanan programlar (checkpoints/<kanal>.jsonl)
+"""
+
+import os
+import time
+import json
+import zlib
+import threading
+from typing import List, Tuple, Dict, Any, Optional
+
+from .m3u import _ensure_dir, _atomic_write, iter_programs
+from .models import Episode
+from .net import log
+
+def ttl_spread(key: str) -> float:
+    """
+    Anahtara göre 1.0–2.0 arası sabit çarpan. Kayıt ömrü TTL × bu değer olunca aynı
+    taramada yazılan binlerce kayıt aynı gün topluca yeniden doğrulanmaz.
+    """
+    return 1.0 + (zlib.crc32(key.encode("utf-8")) % 1000) / 1000.0
+
+def load_state(path: str) -> Dict[str, Any]:
+    """Tek dosyalık JSON durumu okur; dosya yoksa ya da bozuksa boş sözlük."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+def save_state(path: str, state: Dict[str, Any]) -> None:
+    """JSON durumu atomik yazar (anahtarlar sıralı; aynı durum aynı dosyayı üretir)."""
+    _ensure_dir(os.path.dirname(path) or ".")
+    _atomic_write(path, json.dumps(state, ensure_ascii=False, sort_keys=True))
+
+REFERENCE_CACHE_NAME = "episodes.jsonl"
+REFERENCE_TTL_DAYS = 30  # bu süreden eski kayıtlar oynatıcı sayfasından yeniden doğrulanır
+
+class ReferenceCache:
+    """
+    Bölüm URL'si → ReferenceId eşlemesini JSON-lines dosyasında tutar (thread-safe).
+    - Satır biçimi: {"url": ..., "ref": ..., "ts": <son doğrulama, epoch sn>}
+    - Yeni kayıtlar anında dosyanın sonuna eklenir; aynı URL için son satır geçerlidir.
+      `compact()` dosyayı tekrarsız olarak yeniden yazar.
+    - Kaydın ömrü URL'ye göre TTL ile 2×TTL arasında dağıtılır; böylece ilk
+      taramada yazılan binlerce kayıt aynı gün topluca yeniden doğrulanmaz.
+    """
+
+    def __init__(self, ttl_days: float = REFERENCE_TTL_DAYS, label: str = "Referans önbelleği") -> None:
+        self._lock = threading.Lock()
+        self.label = label
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._path: Optional[str] = None
+        self.ttl = ttl_days * 86400
+        self.full_refresh = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path: str) -> None:
+        self._path = path
+        _ensure_dir(os.path.dirname(path))
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    self._entries[rec["url"]] = (rec["ref"], float(rec["ts"]))
+                except (ValueError, KeyError, TypeError):
+                    continue  # yarım kalmış satır
+        log.info("%s yüklendi: %d kayıt", self.label, len(self._entries))
+
+    def _is_fresh(self, url: str, ts: float) -> bool:
+        return time.time() - ts < self.ttl * ttl_spread(url)
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[str]:
+        """Taze kaydı döndürür; `allow_stale` ise süresi dolmuş kaydı da (yedek olarak)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if allow_stale:
+                return entry[0] if entry else None
+            if entry and not self.full_refresh and self._is_fresh(url, entry[1]):
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def put(self, url: str, reference_id: str) -> None:
+        ts = time.time()
+        with self._lock:
+            self._entries[url] = (reference_id, ts)
+            if self._path:
+                with open(self._path, "a", encoding="utf-8", newline="\n") as f:
+                    f.write(json.dumps({"url": url, "ref": reference_id, "ts": int(ts)},
+                                       ensure_ascii=False) + "\n")
+
+    def compact(self) -> None:
+        if not self._path:
+            return
+        with self._lock:
+            lines = [
+                json.dumps({"url": url, "ref": ref, "ts": int(ts)}, ensure_ascii=False)
+                for url, (ref, ts) in self._entries.items()
+            ]
+            _atomic_write(self._path, "".join(line + "\n" for line in lines))
+        log.info("%s: %d isabet, %d yeni/yenilenen istek",
+                 self.label, self.hits, self.misses)
+
+REFERENCE_CACHE = ReferenceCache()
+
+MEDIA_CACHE_NAME = "media.jsonl"
+MEDIA_CACHE = ReferenceCache(label="Media önbelleği")  # anahtar: "<kanal>:<media ID>"
+
+PAGINATION_CACHE_NAME = "pages.json"
+
+class PaginationCache:
+    """
+    `ajax/more` sayfalaması için gözlemler (thread-safe):
+    - tür başına ("dmax:discover", "tlc:episodes" ...) öğrenilmiş sayfa boyutu; bundan kısa
+      bir sayfa son sayfa kabul edilir, boş sayfa istemeye gerek kalmaz. Boyut büyüyünce
+      güncellenir; kısa bir sayfanın ardından dolu sayfa gelirse (site boyutu küçültmüş)
+      relearn() ile aşağı çekilir.
+    - anahtar başına (A-Z listesi, program/sezon) son çalıştırmadaki dolu sayfa sayısı;
+      bilinen aralık paralel çekilebilir.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self.page_sizes: Dict[str, int] = {}
+        self.page_counts: Dict[str, int] = {}
+
+    def load(self, path: str) -> None:
+        self._path = path
+        state = load_state(path)
+        self.page_sizes.update(state.get("page_sizes") or {})
+        self.page_counts.update(state.get("page_counts") or {})
+
+    def save(self) -> None:
+        if not self._path:
+            return
+        with self._lock:
+            save_state(self._path, {"page_sizes": self.page_sizes, "page_counts": self.page_counts})
+
+    def page_size(self, kind: str) -> int:
+        with self._lock:
+            return self.page_sizes.get(kind, 0)
+
+    def observe(self, kind: str, count: int) -> int:
+        with self._lock:
+            size = max(count, self.page_sizes.get(kind, 0))
+            self.page_sizes[kind] = size
+            return size
+
+    def relearn(self, kind: str, size: int) -> None:
+        """Son sayfa sanılan kısa sayfanın ardından öğe geldi: gerçek boyut `size`."""
+        with self._lock:
+            if 0 < size < self.page_sizes.get(kind, 0):
+                self.page_sizes[kind] = size
+
+    def known_pages(self, key: str) -> int:
+        with self._lock:
+            return self.page_counts.get(key, 0)
+
+    def record(self, key: str, pages: int) -> None:
+        with self._lock:
+            self.page_counts[key] = pages
+
+PAGINATION = PaginationCache()
+
+SEASON_CACHE_NAME = "seasons.json"
+SEASON_TTL_DAYS = 30  # parmak izi aynı kalsa da bu süreden sonra sezon baştan gezilir
+
+class SeasonCache:
+    """
+    Program/sezon anahtarı ("dmax:<program ID>/<sezon>") → bölüm listesi (thread-safe).
+    - Her kayıt sezonun ilk sayfasının parmak iziyle saklanır; sonraki taramada ilk
+      sayfa aynıysa sezonun geri kalanı istenmez, kayıtlı liste kullanılır.
+    - Yalnızca en yeni olmayan sezonlar saklanır (en yeni sezon her taramada gezilir).
+    - Kaydın ömrü ReferenceCache gibi TTL ile 2×TTL arasında anahtara göre dağıtılır.
+    """
+
+    def __init__(self, ttl_days: float = SEASON_TTL_DAYS) -> None:
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._entries: Dict[str, dict] = {}
+        self.ttl = ttl_days * 86400
+        self.full_refresh = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path: str) -> None:
+        self._path = path
+        self._entries.update(load_state(path).get("seasons") or {})
+
+    def save(self) -> None:
+        if not self._path:
+            return
+        with self._lock:
+            save_state(self._path, {"seasons": self._entries})
+        log.info("Sezon önbelleği: %d sezon kayıttan, %d sezon baştan gezildi", self.hits, self.misses)
+
+    def get(self, key: str, fingerprint: str) -> Optional[List[dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry and not self.full_refresh and entry.get("fp") == fingerprint
+                    and time.time() - float(entry.get("ts", 0)) < self.ttl * ttl_spread(key)):
+                self.hits += 1
+                return list(entry["episodes"])
+            self.misses += 1
+            return None
+
+    def put(self, key: str, fingerprint: str, episodes: List[dict]) -> None:
+        with self._lock:
+            self._entries[key] = {"fp": fingerprint, "episodes": list(episodes), "ts": int(time.time())}
+
+SEASONS = SeasonCache()
+
+class PlaylistSeed:
+    """
+    Kanalın yazılmış dizi listelerinden (programlar/*.m3u) (kanal, dizi adı, bölüm adı)
+    → Episode eşlemesi (thread-safe okuma). Önbellekte hiç kaydı olmayan bölümler için
+    (ör. .cache'i olmayan yeni CI makinesi) oynatıcı sayfası / media API isteği yerine
+    son bilinen ReferenceId / yayın adresi kullanılır ve önbelleğe yazılır.
+    Aynı listede aynı adla birden çok geçen bölümler belirsiz olduğundan alınmaz.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str, str], Optional[Episode]] = {}
+        self.hits = 0
+
+    def load(self, channel_name: str, folder: str) -> None:
+        try:
+            names = sorted(name for name in os.listdir(folder) if name.endswith(".m3u") and name != "0.m3u")
+        except OSError:
+            return
+        count = 0
+        for name in names:
+            with open(os.path.join(folder, name), encoding="utf-8") as f:
+                for program in iter_programs(f):
+                    for ep in program.episodes:
+                        key = (channel_name, program.name, ep.name)
+                        self._entries[key] = None if key in self._entries else ep
+                        count += 1
+        log.info("[%s] Son listelerden %d bölüm okundu (%d dosya)", channel_name, count, len(names))
+
+    def get(self, channel_name: str, serie_name: str, episode_name: str) -> Optional[Episode]:
+        # Listeye yazılırken dizi adındaki çift tırnak tek tırnağa çevrilir (group-title).
+        key = (channel_name, serie_name.strip().replace('"', "'"), episode_name)
+        with self._lock:
+            ep = self._entries.get(key)
+            if ep is not None:
+                self.hits += 1
+            return ep
+
+SEED = PlaylistSeed()
+
+CHECKPOINT_DIR_NAME = "checkpoints"
+
+def shard_of(url: str, count: int) -> int:
+    """
+    Programın parçası (--shard i/N): URL'nin sabit özeti mod N. A–Z listesine program
+    eklenip çıksa da program hep aynı parçada kalır, parçanın önbelleği sıcak kalır.
+    """
+    return zlib.crc32(url.strip().rstrip("/").encode("utf-8")) % count
+
+class CheckpointJournal:
+    """
+    Yarıda kalan bir taramanın kaldığı yerden sürdürülebilmesi için kanal başına
+    JSON-lines günlüğü (thread-safe), örn. .cache/checkpoints/dmax.jsonl
+    - Satır biçimi: {"i": <program indeksi>, "url": <program URL'si>, "program": <sonuç>}
+    - Her program tamamlandığı anda (bölümleri çözülmüş haliyle) eklenir. Sonuç
+      vermeyen programlar yazılmaz; geçici hatalar sürdürmede yeniden denenir.
+    - `resume=False` ise eski günlük silinir; tarama başarıyla bitince `finish()` siler.
+    - İndeks yanında URL de saklanır; program listesi değiştiyse kayıt kullanılmaz.
+    - Parçalı (--shard) çalıştırmada günlük silinmez, parçanın çıktısı olarak kalır;
+      `complete()` sonuna {"complete": true} satırı ekler, `merge` bunu arar. Program
+      listesi eksik alındıysa satıra "listing": false yazılır (birleştirmede GC yapılmaz);
+      "listed" alanı A–Z listesindeki program URL'leridir (birleştirmede kaçırma sayımı için).
+    """
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        self._lock = threading.Lock()
+        self._path = path
+        self._done: Dict[int, Tuple[str, dict]] = {}
+        self.completed = False
+        self.listing_complete = True
+        self.listed: Optional[List[str]] = None
+        _ensure_dir(os.path.dirname(path))
+        if not resume:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    if rec.get("complete"):
+                        self.completed = True
+                        self.listing_complete = rec.get("listing", True) is not False
+                        self.listed = rec.get("listed")
+                        continue
+                    self._done[int(rec["i"])] = (rec["url"], rec["program"])
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue  # yarım kalmış satır
+        log.info("Kontrol noktası yüklendi: %s (%d program)", os.path.basename(path), len(self._done))
+
+    def get(self, index: int, url: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._done.get(index)
+        if entry and entry[0] == url:
+            return entry[1]
+        return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._done)
+
+    def record(self, index: int, url: str, result: dict) -> None:
+        with self._lock:
+            self._done[index] = (url, result)
+            with open(self._path, "a", encoding="utf-8", newline="\n") as f:
+                f.write(json.dumps({"i": index, "url": url, "program": result}, ensure_ascii=False) + "\n")
+
+    def results(self) -> List[Tuple[int, dict]]:
+        """Kayıtlı sonuçlar, program indeksine göre sıralı."""
+        with self._lock:
+            return sorted(((i, entry[1]) for i, entry in self._done.items()), key=lambda item: item[0])
+
+    def complete(self, listing_complete: bool = True, listed: Optional[List[str]] = None) -> None:
+        with self._lock:
+            self.completed = True
+            self.listing_complete = listing_complete
+            self.listed = listed
+            record: Dict[str, Any] = {"complete": True}
+            if not listing_complete:
+                record["listing"] = False
+            if listed is not None:
+                record["listed"] = listed
+            with open(self._path, "a", encoding="utf-8", newline="\n") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def finish(self) -> None:
+        with self._lock:
+            self._done.clear()
+            if os.path.exists(self._path):
+                os.remove(self._path)
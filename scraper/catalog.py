@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+"""
+Makine tarafından okunur katalog (--catalog jsonl|sqlite), M3U dosyalarıyla aynı geçişte
+- JsonlCatalog  → <output_dir>/catalog.jsonl: satır başına bir program (bölümleri içinde);
+  program tamamlandıkça .tmp'ye akıtılır, close()'da yerine konur.
+- SqliteCatalog → <output_dir>/catalog.sqlite: programs / episodes tabloları, seasons
+  görünümü; ReferenceId, ad ve (program, sezon, bölüm) üzerinde indeksli. Çalıştırma tek
+  işlemdir (transaction); yarıda kalan tarama önceki kataloğu bozmaz.
+Her program ve bölüm için first_seen / last_seen (epoch sn) tutulur. Katalog M3U
+yazıcısının listeleriyle aynı kümeyi içerir: taramada gelmeyen ama listesi korunan
+programların önceki kaydı (last_seen değişmeden) kalır, listesi silinenlerinki silinir.
+"""
+
+import os
+import json
+import time
+import sqlite3
+from typing import List, Dict, Any, Optional, Set, Union
+
+from .m3u import _ensure_dir
+from .models import Program, Episode
+
+CATALOG_NAMES = {"jsonl": "catalog.jsonl", "sqlite": "catalog.sqlite"}
+
+def _episode_key(record: Dict[str, Any]) -> str:
+    return record.get("url") or record.get("reference_id") or record.get("stream_url") or record.get("name") or ""
+
+def _episode_record(ep: Episode) -> Dict[str, Any]:
+    return {"season": ep.season, "number": ep.number, "name": ep.name, "url": ep.url, "img": ep.img,
+            "reference_id": ep.reference_id, "publisher": ep.publisher if not ep.stream else None,
+            "stream_url": ep.stream_url}
+
+class JsonlCatalog:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.now = int(time.time())
+        self._previous = self._load()  # program URL'si → önceki satır (ayrıştırılmış)
+        self._seen: Set[str] = set()
+        _ensure_dir(os.path.dirname(path) or ".")
+        self._file = open(path + ".tmp", "w", encoding="utf-8", newline="\n")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        previous: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and record.get("url"):
+                        previous[record["url"]] = record
+        except OSError:
+            pass
+        return previous
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._seen.add(record["url"])
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def add(self, program: Program) -> None:
+        if not program.url or program.url in self._seen:
+            return
+        previous = self._previous.get(program.url) or {}
+        first_seen = {_episode_key(ep): ep.get("first_seen") for ep in previous.get("episodes") or []}
+        episodes = []
+        for ep in program.episodes:
+            record = _episode_record(ep)
+            record["first_seen"] = first_seen.get(_episode_key(record)) or self.now
+            record["last_seen"] = self.now
+            episodes.append(record)
+        self._write({"url": program.url, "name": program.name, "img": program.img,
+                     "first_seen": previous.get("first_seen") or self.now, "last_seen": self.now,
+                     "episodes": episodes})
+
+    def keep(self, url: str) -> None:
+        """Listesi korunan (taranmayan) program: önceki kaydı olduğu gibi kalır."""
+        if url and url not in self._seen and url in self._previous:
+            self._write(self._previous[url])
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+            os.replace(self.path + ".tmp", self.path)
+
+    def abort(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS programs (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    img TEXT,
+    position INTEGER,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS episodes (
+    program_url TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER,
+    season INTEGER,
+    number INTEGER,
+    name TEXT NOT NULL,
+    url TEXT,
+    img TEXT,
+    reference_id TEXT,
+    publisher INTEGER,
+    stream_url TEXT,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    PRIMARY KEY (program_url, key)
+);
+CREATE INDEX IF NOT EXISTS programs_name ON programs (name);
+CREATE INDEX IF NOT EXISTS episodes_reference_id ON episodes (reference_id);
+CREATE INDEX IF NOT EXISTS episodes_season ON episodes (program_url, season, number);
+CREATE VIEW IF NOT EXISTS seasons AS
+    SELECT program_url, season, COUNT(*) AS episodes, MIN(first_seen) AS first_seen, MAX(last_seen) AS last_seen
+    FROM episodes GROUP BY program_url, season;
+"""
+
+EPISODE_COLUMNS = ("program_url", "key", "position", "season", "number", "name", "url", "img",
+                   "reference_id", "publisher", "stream_url", "first_seen", "last_seen")
+
+class SqliteCatalog:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.now = int(time.time())
+        self._seen: Set[str] = set()
+        _ensure_dir(os.path.dirname(path) or ".")
+        self._db: Optional[sqlite3.Connection] = sqlite3.connect(path)
+        self._db.executescript(SQLITE_SCHEMA)
+
+    def add(self, program: Program) -> None:
+        if not program.url or program.url in self._seen:
+            return
+        db = self._db
+        row = db.execute("SELECT first_seen FROM programs WHERE url = ?", (program.url,)).fetchone()
+        db.execute("INSERT OR REPLACE INTO programs (url, name, img, position, first_seen, last_seen) "
+                   "VALUES (?, ?, ?, ?, ?, ?)", (program.url, program.name, program.img, len(self._seen),
+                                                 row[0] if row else self.now, self.now))
+        first_seen = dict(db.execute("SELECT key, first_seen FROM episodes WHERE program_url = ?", (program.url,)))
+        db.execute("DELETE FROM episodes WHERE program_url = ?", (program.url,))
+        rows: List[tuple] = []
+        keys: Set[str] = set()
+        for position, ep in enumerate(program.episodes):
+            record = _episode_record(ep)
+            key = _episode_key(record)
+            if key in keys:
+                continue
+            keys.add(key)
+            record.update(program_url=program.url, key=key, position=position,
+                          first_seen=first_seen.get(key) or self.now, last_seen=self.now)
+            rows.append(tuple(record[column] for column in EPISODE_COLUMNS))
+        db.executemany(f"INSERT INTO episodes ({', '.join(EPISODE_COLUMNS)}) "
+                       f"VALUES ({', '.join('?' * len(EPISODE_COLUMNS))})", rows)
+        self._seen.add(program.url)
+
+    def keep(self, url: str) -> None:
+        """Listesi korunan (taranmayan) program: kaydı kalır, yalnızca sırası güncellenir."""
+        if url and url not in self._seen:
+            self._db.execute("UPDATE programs SET position = ? WHERE url = ?", (len(self._seen), url))
+            self._seen.add(url)
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        stale = [(url,) for (url,) in self._db.execute("SELECT url FROM programs") if url not in self._seen]
+        self._db.executemany("DELETE FROM episodes WHERE program_url = ?", stale)
+        self._db.executemany("DELETE FROM programs WHERE url = ?", stale)
+        self._db.commit()
+        self._db.close()
+        self._db = None
+
+    def abort(self) -> None:
+        if self._db is not None:
+            self._db.rollback()
+            self._db.close()
+            self._db = None
+
+def open_catalog(output_dir: str, kind: Optional[str]) -> Union[JsonlCatalog, SqliteCatalog, None]:
+    """kind: "jsonl" | "sqlite" | None (katalog yok)."""
+    if not kind:
+        return None
+    path = os.path.join(output_dir, CATALOG_NAMES[kind])
+    return SqliteCatalog(path) if kind == "sqlite" else JsonlCatalog(path)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Kanal kayıt defteri
+Her kanal bir ChannelConfig ile tanımlanır; `kind` hangi scraper modülünün
+kullanılacağını belirler:
+  - "discovery" → dmax.com.tr / tlctv.com.tr altyapısı (scraper.discovery)
+  - "kanald"    → kanald.com.tr dizi sayfaları (scraper.kanald)
+Yeni bir kanal eklemek için CHANNELS sözlüğüne bir kayıt eklemek yeterlidir.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Tuple, Dict, Any
+from urllib.parse import urljoin
+
+from .net import REQUEST_TIMEOUT
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR = str(ROOT_DIR / ".cache")
+SHARD_DIR = str(ROOT_DIR / ".shards")  # --shard çıktıları; `merge` buradan okur
+
+@dataclass(frozen=True)
+class ChannelConfig:
+    name: str                    # CLI adı ve log öneki
+    kind: str                    # "discovery" | "kanald"
+    base_url: str
+    output_dir: str              # M3U klasörü; diziler <output_dir>/programlar altına yazılır
+    all_m3u_name: str = ""       # birleşik liste adı (DMAX → DMAX.m3u); boşsa yazılmaz
+    series_master: bool = False  # True → programlar/0.m3u da üretilir
+    publisher_ids: Tuple[int, ...] = ()
+    series_urls: Tuple[str, ...] = ()
+    series_file: str = ""        # satır başına bir dizi URL'si/yolu; series_urls'e eklenir
+    request_timeout: float = REQUEST_TIMEOUT
+    extra_headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ajax_url(self) -> str:
+        return urljoin(self.base_url, "ajax/more")
+
+    @property
+    def series_dir(self) -> str:
+        return str(Path(self.output_dir) / "programlar")
+
+    @property
+    def request_options(self) -> Dict[str, Any]:
+        """get_soup_from_get / get_soup_from_post'a geçilen kanal başlıkları ve zaman aşımı."""
+        headers = {"Referer": self.base_url}
+        headers.update(self.extra_headers)
+        return {"headers": headers, "timeout": self.request_timeout}
+
+# dmax.com.tr ve tlctv.com.tr: ajax/more uç noktası form POST'u bekler
+DISCOVERY_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "X-Requested-With": "XMLHttpRequest",
+}
+
+CHANNELS: Dict[str, ChannelConfig] = {
+    "dmax": ChannelConfig(
+        name="dmax",
+        kind="discovery",
+        base_url="https://www.dmax.com.tr/",
+        output_dir=str(ROOT_DIR / "DMAX"),
+        all_m3u_name="DMAX",
+        publisher_ids=(27, 20),  # DMAX genelde 27; alternatif olarak 20'yi de dene
+        extra_headers=DISCOVERY_HEADERS,
+    ),
+    "tlc": ChannelConfig(
+        name="tlc",
+        kind="discovery",
+        base_url="https://www.tlctv.com.tr/",
+        output_dir=str(ROOT_DIR / "TLC"),
+        all_m3u_name="TLC",
+        publisher_ids=(20, 27),  # önce 20, sonra 27 dene
+        extra_headers=DISCOVERY_HEADERS,
+    ),
+    "kanald": ChannelConfig(
+        name="kanald",
+        kind="kanald",
+        base_url="https://www.kanald.com.tr/",
+        output_dir=str(ROOT_DIR / "KanalD"),
+        all_m3u_name="KanalD",
+        series_file=str(ROOT_DIR / "KanalD" / "diziler.txt"),
+        request_timeout=20,
+        extra_headers={
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                "(KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+            ),
+        },
+    ),
+}
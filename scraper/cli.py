@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tek giriş noktası: birden çok kanalı tek süreçte çalıştırır.
+Kanallar aynı bağlantı havuzunu (SESSION), aynı önbellekleri (.cache) ve aynı
+işçi havuzlarını paylaşır; her kanal kendi iş parçacığında eşzamanlı ilerler.
+
+Kullanım:
+  python -m scraper                       # tüm kanallar
+  python -m scraper dmax tlc
+  python -m scraper dmax --start 10 --end 50
+  python -m scraper --workers 16 --rate 10
+  python -m scraper --full-refresh
+  python -m scraper --no-http-cache
+  python -m scraper --resume              # yarıda kalan taramayı sürdür
+  python -m scraper kanald --series esref-ruya --series https://www.kanald.com.tr/<dizi>
+  python -m scraper kanald --series-file diziler.txt
+  python -m scraper --validate-streams    # yayın adaylarını yokla, çalışan PublisherId'yi seç
+  python -m scraper --resolve-hls         # redirect yerine son HLS master adresini yaz
+  python -m scraper --schedule            # durgun programları seyrek tara (son listeleri korunur)
+  python -m scraper --catalog sqlite      # M3U'larla birlikte <kanal>/catalog.sqlite (jsonl da olur)
+  python -m scraper dmax --shard 0/4      # programların 1/4'ü → .shards/dmax/0-of-4.jsonl
+  python -m scraper merge dmax --shards 4 # parçaları DMAX.m3u + programlar/*.m3u olarak birleştir
+"""
+
+import os
+import sys
+import time
+import argparse
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional
+
+from . import net, channels, discovery, kanald
+from .cache import (REFERENCE_CACHE, REFERENCE_CACHE_NAME, REFERENCE_TTL_DAYS, PAGINATION, PAGINATION_CACHE_NAME,
+                    SEASONS, SEASON_CACHE_NAME, MEDIA_CACHE, MEDIA_CACHE_NAME, SEED, CHECKPOINT_DIR_NAME,
+                    CheckpointJournal)
+from .catalog import CATALOG_NAMES
+from .channels import CHANNELS, ChannelConfig
+from .m3u import GC_AFTER_MISSES
+from .models import Program
+from .schedule import SCHEDULE, SCHEDULE_NAME
+from .net import HTTP_CACHE, HTTP_CACHE_NAME, HTTP_CACHE_TTL_DAYS, RATE_LIMITER, log
+from .telemetry import TELEMETRY, REPORT_NAME
+from .streams import (STREAM_VALIDATOR, STREAM_PROBE_WORKERS, STREAM_VERDICT_TTL_DAYS, STREAM_WINNERS_NAME,
+                      DEAD_STREAMS_NAME, HLS_RESOLVER, HLS_CACHE_NAME, HLS_TTL_HOURS)
+
+SCRAPERS = {
+    "discovery": discovery,
+    "kanald": kanald,
+}
+
+def _parse_shard(value: str) -> Tuple[int, int]:
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("biçim i/N olmalı (örn. 0/4)")
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError("0 <= i < N olmalı")
+    return index, count
+
+def _shard_path(shard_dir: str, channel_name: str, index: int, count: int) -> str:
+    return os.path.join(shard_dir, channel_name, f"{index}-of-{count}.jsonl")
+
+def _check_channels(parser: argparse.ArgumentParser, names: List[str]) -> None:
+    unknown = [name for name in names if name not in CHANNELS]
+    if unknown:
+        parser.error(f"bilinmeyen kanal: {', '.join(unknown)}")
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m scraper", description="Kanal M3U scraper")
+    parser.add_argument("channels", nargs="*", metavar="kanal",
+                        help=f"çalıştırılacak kanallar ({', '.join(CHANNELS)}); boşsa hepsi")
+    parser.add_argument("--start", type=int, default=0, help="başlangıç program indeksi")
+    parser.add_argument("--end", type=int, default=0, help="bitiş program indeksi (0 = son)")
+    parser.add_argument("--series", action="append", default=[], metavar="URL",
+                        help="Kanal D: yalnızca bu diziyi tara (tekrarlanabilir; tam URL ya da yol)")
+    parser.add_argument("--series-file", help="Kanal D: dizi listesi dosyası (satır başına bir dizi)")
+    parser.add_argument("--workers", type=int, default=net.MAX_WORKERS,
+                        help="eşzamanlı işçi sayısı (1 = sıralı)")
+    parser.add_argument("--rate", type=float, default=net.HOST_RATE_LIMIT,
+                        help="host başına başlangıç hızı, istek/sn (0 = sınırsız)")
+    parser.add_argument("--max-rate", type=float, default=net.HOST_RATE_LIMIT_MAX,
+                        help="uyarlanır hızın üst sınırı (--rate'ten küçük/eşitse hız sabit kalır)")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="referans ve sezon önbelleklerini yok say, tüm sezonları ve oynatıcı sayfalarını yeniden çek")
+    parser.add_argument("--cache-ttl", type=float, default=REFERENCE_TTL_DAYS,
+                        help="önbellek kaydının yeniden doğrulanmadan kullanılacağı gün sayısı")
+    parser.add_argument("--no-http-cache", action="store_true",
+                        help="program/sezon sayfaları için koşullu HTTP önbelleğini kapat")
+    parser.add_argument("--http-cache-ttl", type=float, default=HTTP_CACHE_TTL_DAYS,
+                        help="bu kadar gün kullanılmayan HTTP önbelleği kayıtlarını sil (0 = silme)")
+    parser.add_argument("--no-seed", action="store_true",
+                        help="önbellekte olmayan bölümler için diskteki son M3U listelerini kullanma "
+                             "(--full-refresh ile de kapanır)")
+    parser.add_argument("--validate-streams", action="store_true",
+                        help="aday yayın URL'lerini HEAD/ranged GET ile yokla, ölüleri listeye yazma")
+    parser.add_argument("--probe-workers", type=int, default=STREAM_PROBE_WORKERS,
+                        help="eşzamanlı yayın yoklaması sayısı")
+    parser.add_argument("--probe-ttl", type=float, default=STREAM_VERDICT_TTL_DAYS,
+                        help="yoklanmış adayın sonucunun yeniden yoklanmadan kullanılacağı gün sayısı")
+    parser.add_argument("--resolve-hls", action="store_true",
+                        help="redirect adresini tarama sırasında izleyip son HLS master URL'sini yaz")
+    parser.add_argument("--hls-ttl", type=float, default=HLS_TTL_HOURS,
+                        help="süre bilgisi taşımayan çözülmüş HLS adreslerinin saat cinsinden ömrü")
+    parser.add_argument("--schedule", action="store_true",
+                        help="uzun süredir değişmeyen programları her çalıştırmada değil, seyrek aralıklarla tara "
+                             "(program sırası her zaman önceliğe göredir; --full-refresh ile kapanır)")
+    parser.add_argument("--resume", action="store_true",
+                        help="yarıda kalan taramayı kontrol noktasından sürdür (tamamlanan programları yeniden çekme)")
+    parser.add_argument("--shard", type=_parse_shard, metavar="i/N",
+                        help="programların yalnızca i. parçasını (URL özeti mod N) tara; M3U yerine "
+                             "parça dosyası yazılır, `merge` ile birleştirilir")
+    parser.add_argument("--shard-dir", default=channels.SHARD_DIR, help="parça dosyaları klasörü")
+    parser.add_argument("--gc-after", type=int, default=GC_AFTER_MISSES, metavar="N",
+                        help="art arda N tam taramada çıkmayan programın listesini sil (0 = silme); "
+                             "o zamana kadar son sağlam listesi korunur")
+    parser.add_argument("--catalog", choices=sorted(CATALOG_NAMES),
+                        help="M3U'larla aynı geçişte <output_dir>/catalog.<biçim> kataloğunu da yaz")
+    parser.add_argument("--cache-dir", default=channels.CACHE_DIR, help="önbellek klasörü")
+    parser.add_argument("--report", help=f"JSON çalıştırma raporu (varsayılan: <cache-dir>/{REPORT_NAME})")
+    args = parser.parse_args(argv)
+    _check_channels(parser, args.channels)
+    return args
+
+def parse_merge_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m scraper merge",
+                                     description="--shard çıktılarını M3U dosyalarında birleştirir")
+    parser.add_argument("channels", nargs="*", metavar="kanal",
+                        help=f"birleştirilecek kanallar ({', '.join(CHANNELS)}); boşsa hepsi")
+    parser.add_argument("--shards", type=int, required=True, metavar="N", help="toplam parça sayısı")
+    parser.add_argument("--shard-dir", default=channels.SHARD_DIR, help="parça dosyaları klasörü")
+    parser.add_argument("--allow-partial", action="store_true",
+                        help="eksik/yarım parçalar olsa da eldekileri birleştir")
+    parser.add_argument("--gc-after", type=int, default=GC_AFTER_MISSES, metavar="N",
+                        help="art arda N tam birleştirmede çıkmayan programın listesini sil (0 = silme)")
+    parser.add_argument("--catalog", choices=sorted(CATALOG_NAMES),
+                        help="M3U'larla aynı geçişte <output_dir>/catalog.<biçim> kataloğunu da yaz")
+    args = parser.parse_args(argv)
+    _check_channels(parser, args.channels)
+    return args
+
+def run_channel(channel: ChannelConfig,
+                program_pool: ThreadPoolExecutor,
+                episode_pool: ThreadPoolExecutor,
+                start: int = 0, end: int = 0,
+                checkpoint: Optional[CheckpointJournal] = None,
+                shard: Optional[Tuple[int, int]] = None,
+                gc_after: int = 0,
+                catalog: Optional[str] = None) -> None:
+    """
+    Kanalı tarar; her program tamamlandığında M3U dosyalarına akıtılır. Tarama
+    hata ile biterse dizi dosyaları yazılmış olarak kalır, birleşik liste ise
+    önceki tam haliyle korunur (kısmi hali <liste>.m3u.tmp'de). Kontrol noktası
+    günlüğü yalnızca tarama başarıyla bitince silinir.
+    Tarama bitince writer.reconcile(gc_after): gelmeyen programların son sağlam
+    listeleri korunur; gc_after > 0 ise art arda gc_after kez gelmeyenler silinir.
+    Program listesi alınamazsa (run() hata verir) reconcile yapılmaz; listesi eksik
+    alındıysa kaçırma sayılmaz. Listede olup taranamayan program da kaçırma sayılmaz.
+    Parça modunda M3U yazılmaz; günlük parçanın çıktısıdır ve sonunda tamamlandı
+    olarak işaretlenir.
+    """
+    scraper = SCRAPERS[channel.kind]
+    started = time.perf_counter()
+    if shard:
+        try:
+            result = scraper.run(channel, program_pool, episode_pool, start=start, end=end,
+                                 sink=lambda result, index: None, checkpoint=checkpoint, shard=shard)
+        except Exception as e:
+            log.exception("[%s] Tarama hatası: %s", channel.name, e)
+            TELEMETRY.channel(channel.name, failed=True, seconds=round(time.perf_counter() - started, 1))
+            return
+        checkpoint.complete(listing_complete=result.get("complete", True), listed=result.get("listed"))
+        log.info("[%s] Parça %d/%d tamamlandı: %d program", channel.name, shard[0], shard[1], len(checkpoint))
+        TELEMETRY.channel(channel.name, programs=len(checkpoint),
+                          seconds=round(time.perf_counter() - started, 1))
+        return
+    try:
+        with scraper.open_writer(channel, catalog=catalog) as writer:
+            result = scraper.run(channel, program_pool, episode_pool, start=start, end=end,
+                                 sink=writer.add, checkpoint=checkpoint)
+            listed = result.get("listed")
+            writer.reconcile(gc_after if result.get("complete", True) else 0,
+                             listed=set(listed) if listed is not None else None)
+    except Exception as e:
+        log.exception("[%s] Tarama hatası: %s", channel.name, e)
+        TELEMETRY.channel(channel.name, failed=True, seconds=round(time.perf_counter() - started, 1))
+        return
+    if checkpoint is not None:
+        checkpoint.finish()
+    if writer.gc_blocked:
+        log.warning("[%s] %d listenin silinmesi gerekiyordu; tek taramada silme sınırı aşıldığı için "
+                    "korundu (site/keşif sorunu olabilir).", channel.name, writer.gc_blocked)
+    TELEMETRY.channel(channel.name, programs=writer.programs, episodes=writer.episodes,
+                      files_written=writer.written, files_unchanged=writer.unchanged,
+                      changed_programs=len(writer.changes), kept_programs=writer.kept,
+                      skipped_programs=writer.skipped, gc_blocked=writer.gc_blocked,
+                      removed_programs=writer.removed, seconds=round(time.perf_counter() - started, 1))
+    log.info("[%s] M3U dosyaları oluşturuldu: %d program, %d bölüm (%d dosya yazıldı, %d değişmedi; "
+             "%d programda değişiklik; %d atlandı, %d eski liste korundu, %d silindi)", channel.name,
+             writer.programs, writer.episodes, writer.written, writer.unchanged, len(writer.changes),
+             writer.skipped, writer.kept, writer.removed)
+
+def merge_main(argv: List[str]) -> None:
+    """
+    Parça dosyalarını program indeksine göre sıralayıp tek bir çalıştırmanın
+    üreteceği M3U dosyalarının aynısını yazar. Eksik ya da yarım parça varsa
+    (--allow-partial verilmedikçe) kanal atlanır, önceki M3U dosyaları korunur.
+    """
+    args = parse_merge_args(argv)
+    for name in (args.channels or CHANNELS):
+        channel = CHANNELS[name]
+        journals = [
+            CheckpointJournal(_shard_path(args.shard_dir, name, index, args.shards), resume=True)
+            for index in range(args.shards)
+        ]
+        incomplete = [index for index, journal in enumerate(journals) if not journal.completed]
+        if incomplete and not args.allow_partial:
+            log.error("[%s] Eksik/yarım parçalar: %s; birleştirme atlandı.",
+                      name, ", ".join(f"{index}/{args.shards}" for index in incomplete))
+            continue
+
+        # Parçalar A–Z listesini ayrı ayrı alır; liste arada kaydıysa aynı indeks iki
+        # parçada görülebilir, anahtar (indeks, URL) olduğu için biri diğerini ezmez.
+        merged = {}
+        for journal in journals:
+            merged.update(((index, program.get("url", "")), program) for index, program in journal.results())
+        with SCRAPERS[channel.kind].open_writer(channel, catalog=args.catalog) as writer:
+            for index in sorted(merged):
+                writer.add(Program.from_dict(merged[index]))
+            # Eksik parçayla ya da A–Z listesi eksik alınmış parçayla birleştirmede
+            # gelmeyen programlar korunur ama sayılmaz.
+            partial = incomplete or not all(journal.listing_complete for journal in journals)
+            # Listede olup hiçbir parçada taranamayan programlar kaçırma sayılmaz.
+            listed = None if any(journal.listed is None for journal in journals) else {
+                url for journal in journals for url in journal.listed}
+            writer.reconcile(0 if partial else args.gc_after, listed=listed)
+        log.info("[%s] %d parça birleştirildi: %d program, %d bölüm (%d dosya yazıldı, %d değişmedi; "
+                 "%d eski liste korundu, %d silindi)", name, args.shards, writer.programs, writer.episodes,
+                 writer.written, writer.unchanged, writer.kept, writer.removed)
+        if writer.gc_blocked:
+            log.warning("[%s] %d listenin silinmesi gerekiyordu; tek birleştirmede silme sınırı aşıldığı için "
+                        "korundu.", name, writer.gc_blocked)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "merge":
+        merge_main(argv[1:])
+        return
+    args = parse_args(argv)
+    selected = [CHANNELS[name] for name in (args.channels or CHANNELS)]
+    if args.series or args.series_file:
+        selected = [
+            dataclasses.replace(channel, series_urls=tuple(args.series), series_file=args.series_file or "")
+            if channel.kind == "kanald" else channel
+            for channel in selected
+        ]
+
+    net.MAX_WORKERS = max(1, args.workers)
+    RATE_LIMITER.rate = args.rate
+    RATE_LIMITER.max_rate = args.max_rate
+    REFERENCE_CACHE.ttl = args.cache_ttl * 86400
+    REFERENCE_CACHE.full_refresh = args.full_refresh
+    REFERENCE_CACHE.load(os.path.join(args.cache_dir, REFERENCE_CACHE_NAME))
+    MEDIA_CACHE.ttl = REFERENCE_CACHE.ttl
+    MEDIA_CACHE.full_refresh = args.full_refresh
+    MEDIA_CACHE.load(os.path.join(args.cache_dir, MEDIA_CACHE_NAME))
+    PAGINATION.load(os.path.join(args.cache_dir, PAGINATION_CACHE_NAME))
+    SEASONS.full_refresh = args.full_refresh
+    SEASONS.load(os.path.join(args.cache_dir, SEASON_CACHE_NAME))
+    SCHEDULE.enabled = args.schedule and not args.full_refresh
+    SCHEDULE.load(os.path.join(args.cache_dir, SCHEDULE_NAME))
+    if not (args.no_seed or args.full_refresh):
+        for channel in selected:
+            SEED.load(channel.name, channel.series_dir)
+    if not args.no_http_cache:
+        HTTP_CACHE.ttl = args.http_cache_ttl * 86400
+        HTTP_CACHE.load(os.path.join(args.cache_dir, HTTP_CACHE_NAME))
+    if args.validate_streams:
+        STREAM_VALIDATOR.enabled = True
+        STREAM_VALIDATOR.workers = max(1, args.probe_workers)
+        STREAM_VALIDATOR.ttl = args.probe_ttl * 86400
+        STREAM_VALIDATOR.full_refresh = args.full_refresh
+        STREAM_VALIDATOR.load(os.path.join(args.cache_dir, STREAM_WINNERS_NAME))
+    if args.resolve_hls:
+        HLS_RESOLVER.enabled = True
+        HLS_RESOLVER.ttl = args.hls_ttl * 3600
+        HLS_RESOLVER.load(os.path.join(args.cache_dir, HLS_CACHE_NAME))
+
+    # Günlük, aralığa göre ayrı tutulur; farklı --start/--end ile sürdürme karışmaz.
+    # Parça modunda günlük, parçanın çıktı dosyasıdır.
+    suffix = f"-{args.start}-{args.end}" if args.start or args.end else ""
+    checkpoints = {
+        channel.name: CheckpointJournal(
+            _shard_path(args.shard_dir, channel.name, *args.shard) if args.shard else
+            os.path.join(args.cache_dir, CHECKPOINT_DIR_NAME, f"{channel.name}{suffix}.jsonl"),
+            resume=args.resume,
+        )
+        for channel in selected
+    }
+
+    # Yalnızca tam tarama kaçırma sayar; aralıklı/seçili taramada gelmeyenler yalnızca korunur.
+    gc_after = 0 if args.start or args.end or args.series or args.series_file else max(0, args.gc_after)
+
+    # Program işçileri yalnızca sezon ve bölüm havuzlarını, sezon görevleri (discovery)
+    # yalnızca bölüm havuzunu, kanal iş parçacıkları da yalnızca program havuzunu
+    # bekler; bekleme zinciri tek yönlü olduğundan kilitlenme olmaz.
+    with ThreadPoolExecutor(max_workers=net.MAX_WORKERS, thread_name_prefix="bolum") as episode_pool, \
+         ThreadPoolExecutor(max_workers=net.MAX_WORKERS, thread_name_prefix="program") as program_pool, \
+         ThreadPoolExecutor(max_workers=len(selected), thread_name_prefix="kanal") as channel_pool:
+        list(channel_pool.map(
+            lambda channel: run_channel(channel, program_pool, episode_pool, start=args.start, end=args.end,
+                                        checkpoint=checkpoints[channel.name], shard=args.shard,
+                                        gc_after=gc_after, catalog=args.catalog),
+            selected,
+        ))
+
+    discovery.close_season_pool()
+    STREAM_VALIDATOR.close()
+    REFERENCE_CACHE.compact()
+    MEDIA_CACHE.compact()
+    PAGINATION.save()
+    SEASONS.save()
+    SCHEDULE.save()
+    STREAM_VALIDATOR.save()
+    HLS_RESOLVER.save()
+    HTTP_CACHE.prune()
+    STREAM_VALIDATOR.report(os.path.join(args.cache_dir, DEAD_STREAMS_NAME))
+    HTTP_CACHE.report()
+    RATE_LIMITER.report()
+    TELEMETRY.report(args.report or os.path.join(args.cache_dir, REPORT_NAME), {
+        "reference": {"hits": REFERENCE_CACHE.hits, "misses": REFERENCE_CACHE.misses},
+        "media": {"hits": MEDIA_CACHE.hits, "misses": MEDIA_CACHE.misses},
+        "seasons": {"hits": SEASONS.hits, "misses": SEASONS.misses},
+        "seed": {"hits": SEED.hits},
+        "http": {"hits": HTTP_CACHE.hits, "misses": HTTP_CACHE.misses, "bytes_saved": HTTP_CACHE.bytes_saved,
+                 "reused": HTTP_CACHE.reused, "pruned": HTTP_CACHE.pruned},
+        "schedule": {"skipped": SCHEDULE.skipped, "new_seasons": SCHEDULE.new_seasons},
+        "hls": {"hits": HLS_RESOLVER.hits, "resolved": HLS_RESOLVER.resolved, "fallbacks": HLS_RESOLVER.fallbacks},
+        "streams": {"alive": STREAM_VALIDATOR.alive, "dead": len(STREAM_VALIDATOR.dead),
+                    "unverified": STREAM_VALIDATOR.unverified, "probed": STREAM_VALIDATOR.probed,
+                    "hits": STREAM_VALIDATOR.hits},
+    })
+
+def channel_main(name: str, argv: Optional[List[str]] = None) -> None:
+    """
+    Eski tek-kanal betikleri (DMAX/dmax.py vb.) için uyumluluk girişi:
+      python DMAX/dmax.py 10 50 --workers 4  →  python -m scraper dmax --start 10 --end 50 --workers 4
+    """
+    rest = list(sys.argv[1:] if argv is None else argv)
+    range_args: List[str] = []
+    for flag in ("--start", "--end"):
+        if rest and rest[0].isdigit():
+            range_args += [flag, rest.pop(0)]
+    main([name, *range_args, *rest])
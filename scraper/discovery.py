@@ -0,0 +1,657 @@
+# -*- coding: utf-8 -*-
+
+"""
+DMAX / TLC scraper (dmax.com.tr ve tlctv.com.tr aynı site altyapısını kullanır)
+Akış: A-Z listesi (ajax/more) → program sayfası (program ID + sezonlar)
+      → sezon sayfaları (ajax/more) → bölüm oynatıcı sayfası (data-video-code)
+      → dygvideo redirect URL'leri
+"""
+
+import os
+import re
+import html
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Tuple, Dict, Any, Optional, Callable, Sequence, Union
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from bs4 import SoupStrainer
+from tqdm import tqdm
+
+from . import net
+from .cache import PAGINATION, REFERENCE_CACHE, SEASONS, SEED, CheckpointJournal, shard_of
+from .catalog import open_catalog
+from .channels import ChannelConfig
+from .m3u import M3UStreamWriter, CHANGES_NAME, PLAYLISTS_NAME
+from .models import Program, Episode, render_stream_url
+from .schedule import SCHEDULE, skipped, completed
+from .streams import STREAM_VALIDATOR, HLS_RESOLVER
+from .telemetry import TELEMETRY, instrumented
+from .net import log, safe_soup_get, has_class, make_soup, get_content_from_get, get_extracted_from_get, get_extracted_from_post
+
+# Seçici ayrıştırma: tam sayfalardan yalnızca kullandığımız düğümler ağaca alınır.
+# ajax/more yanıtları zaten yalnızca poster/item parçalarından oluştuğu için süzülmez.
+PROGRAM_PAGE_STRAINER = SoupStrainer(class_=has_class("dyn-link", "custom-dropdown", "episodes"))
+VIDEO_PLAYER_STRAINER = SoupStrainer("div", class_=has_class("video-player"))
+
+_SEASON_TITLE_RE = re.compile(r"(\d+)\.\s*Sezon", re.I)
+_EPISODE_TITLE_RE = re.compile(r"(\d+)\.\s*Bölüm", re.I)
+_SEASON_URL_RE = re.compile(r"/sezon-(\d+)(?:/|$)")
+_EPISODE_URL_RE = re.compile(r"/bolum-(\d+)(?:/|$)")
+
+_CLASS_ATTR_RE = re.compile(rb"""(?<![\w-])class\s*=\s*["']([^"']*)["']""", re.I)
+_VIDEO_CODE_ATTR_RE = re.compile(rb"""(?<![\w-])data-video-code\s*=\s*["']([^"']*)["']""", re.I)
+
+def scan_video_code(content: bytes) -> Optional[str]:
+    """
+    Oynatıcı sayfasında DOM kurmadan ilk <div class="... video-player ..."> etiketini
+    bulur ve data-video-code değerini döndürür. Etiket bulunamazsa None.
+    """
+    pos = content.find(b"video-player")
+    while pos != -1:
+        start = content.rfind(b"<", 0, pos)
+        end = content.find(b">", pos)
+        tag = content[start:end + 1] if start != -1 and end != -1 else b""
+        cls = _CLASS_ATTR_RE.search(tag) if tag[:4].lower() == b"<div" else None
+        if cls and b"video-player" in cls.group(1).split():
+            code = _VIDEO_CODE_ATTR_RE.search(tag)
+            return html.unescape(code.group(1).decode("utf-8", "replace")) if code else ""
+        pos = content.find(b"video-player", pos + 1)
+    return None
+
+def build_candidate_stream_urls(channel: ChannelConfig, reference_id: str) -> List[str]:
+    return [render_stream_url(reference_id, pid) for pid in channel.publisher_ids]
+
+def extract_img_url(img_tag) -> str:
+    """Poster <img> tag'inden en iyi görsel URL'sini seç (data-src > srcset > src)."""
+    if not img_tag:
+        return ""
+    data_src = img_tag.get("data-src") or img_tag.get("data-original") or img_tag.get("data-lazy-src")
+    if data_src:
+        return data_src.strip()
+    srcset = img_tag.get("srcset")
+    if srcset:
+        parts = [p.strip().split(" ")[0] for p in srcset.split(",") if p.strip()]
+        if parts:
+            return parts[-1]
+    return (img_tag.get("src") or "").strip()
+
+# ============================
+# SAYFALAMA (ERKEN DURMA)
+# ============================
+
+class PageItems(list):
+    """Sayfanın ayrıştırılmış öğeleri; `nodes` = bağlantısız öğeler dahil ham düğüm sayısı."""
+
+    def __init__(self, items: List[Dict[str, str]], nodes: int) -> None:
+        super().__init__(items)
+        self.nodes = nodes
+
+def page_nodes(items: List[Dict[str, str]]) -> int:
+    """Sayfa boyutu karşılaştırmaları için ham düğüm sayısı (PageItems değilse öğe sayısı)."""
+    return getattr(items, "nodes", len(items))
+
+def paginate(fetch_page: Callable[[int], Optional[List[Dict[str, str]]]],
+             kind: str,
+             key: str,
+             pool: Optional[ThreadPoolExecutor] = None,
+             max_failed_pages: int = 2,
+             first_page: Optional[List[Dict[str, str]]] = None,
+             failed_pages: Optional[List[int]] = None,
+             prefetched: Optional[Sequence["Future[Optional[List[Dict[str, str]]]]"]] = None) -> List[Dict[str, str]]:
+    """
+    Sayfa 0'dan başlayarak `fetch_page` ile gezer ve tüm öğeleri sırayla döndürür.
+    - Boş sayfa veya öğrenilmiş sayfa boyutundan kısa sayfa → son sayfa, dur. Boyut
+      ayrıştırılan öğelerle değil sayfadaki ham düğüm sayısıyla (page_nodes) ölçülür.
+      Önceki çalıştırmada bu anahtarda daha çok sayfa varsa kısa sayfada durulmaz;
+      ardından dolu sayfa gelirse sayfa boyutu kısa sayfanınkine indirilir.
+    - `fetch_page` None döndürürse (istek hatası) sonraki sayfaya geçilir;
+      art arda `max_failed_pages` hata olursa durulur. Hatalı sayfa numaraları
+      `failed_pages` listesine eklenir.
+    - Önceki çalıştırmadan bilinen sayfa aralığı `pool` verilmişse paralel çekilir,
+      son sayfa doluysa sıralı olarak devam edilir.
+    - `first_page` → sayfa 0 zaten elde varsa (sezon parmak izi, program sayfasına
+      gömülü bölümler) yeniden istenmez.
+    - `prefetched` → sonraki sayfalar için önceden prefetch_pages() ile başlatılmış
+      istekler (birden çok sezonun sayfaları aynı anda kuyruğa girsin diye).
+    """
+    if prefetched is None:
+        prefetched = prefetch_pages(fetch_page, key, pool, start=0 if first_page is None else 1)
+    ahead: List[Union[Optional[List[Dict[str, str]]], Future]] = [first_page] if first_page is not None else []
+    ahead += prefetched
+
+    all_items: List[Dict[str, str]] = []
+    page = 0
+    pages = 0
+    failed = 0
+    short = 0  # son sayfa sayılmayan kısa sayfanın düğüm sayısı
+    known = PAGINATION.known_pages(key)
+    while True:
+        if page < len(ahead):
+            page_items = ahead[page].result() if isinstance(ahead[page], Future) else ahead[page]
+        else:
+            page_items = fetch_page(page)
+        page += 1
+        if page_items is None:
+            failed += 1
+            if failed_pages is not None:
+                failed_pages.append(page - 1)
+            log.info("Hatalı sayfa: %s/%d (ardışık=%d)", key, page - 1, failed)
+            if failed >= max_failed_pages:
+                break
+            continue
+        failed = 0
+        if not page_items:
+            break
+        if short:
+            PAGINATION.relearn(kind, short)
+            short = 0
+        all_items.extend(page_items)
+        pages = page
+        nodes = page_nodes(page_items)
+        if nodes < PAGINATION.observe(kind, nodes):
+            if page >= known:
+                break
+            short = nodes
+
+    PAGINATION.record(key, pages)
+    return all_items
+
+def prefetch_pages(fetch_page: Callable[[int], Optional[List[Dict[str, str]]]],
+                   key: str,
+                   pool: Optional[ThreadPoolExecutor],
+                   start: int = 0) -> List["Future[Optional[List[Dict[str, str]]]]"]:
+    """Önceki çalıştırmadan bilinen sayfaları (start..bilinen son sayfa) havuza gönderir."""
+    known = PAGINATION.known_pages(key)
+    if not pool or known <= 1:
+        return []
+    return [pool.submit(fetch_page, page) for page in range(start, known)]
+
+# ============================
+# SCRAPER (DAYANIKLI SÜRÜM)
+# ============================
+
+@instrumented("programs.page")
+def get_single_program_page(channel: ChannelConfig, page: int = 0) -> Optional[List[Dict[str, str]]]:
+    """
+    Keşfet / A-Z sayfasından program adı, sayfa URL'si ve POSTER görselini alır.
+    İstek başarısızsa None döner.
+    """
+    data = {"type": "discover", "slug": "a-z", "page": page}
+    extracted = get_extracted_from_post(channel.ajax_url, data, lambda soup: _program_page_rows(channel, soup),
+                                        "programs.page", **channel.request_options)
+    if not extracted:
+        return None
+    return PageItems(extracted["items"], extracted["nodes"])
+
+def _program_page_rows(channel: ChannelConfig, soup) -> Dict[str, Any]:
+    """A-Z sayfasının önbelleğe yazılabilir özeti: {"items": [...], "nodes": ham düğüm sayısı}."""
+    all_programs: List[Dict[str, str]] = []
+    programs = soup.find_all("div", {"class": "poster"})
+    for program in programs:
+        a = program.find("a")
+        img_tag = program.find("img")
+
+        # Mutlak URL'lere dönüştür
+        program_url_rel = a.get("href") if a else ""
+        program_url = urljoin(channel.base_url, program_url_rel)
+
+        # Poster: keşfet/a-z'deki poster (lazy-load destekli)
+        poster_rel = extract_img_url(img_tag)
+        program_img = urljoin(channel.base_url, poster_rel)
+
+        # Ad: onclick > alt > text
+        onclick_name = a.get("onclick") if a else None
+        if onclick_name and "GAEventTracker" in onclick_name:
+            program_name = (
+                onclick_name.replace("GAEventTracker('DISCOVER_PAGE_EVENTS', 'POSTER_CLICKED', '", "")
+                            .replace("');", "")
+                            .strip()
+            )
+        else:
+            program_name = (
+                (img_tag.get("alt").strip() if img_tag and img_tag.get("alt") else None)
+                or (a.get_text(strip=True) if a else None)
+                or "İsimsiz Program"
+            )
+
+        all_programs.append({"img": program_img, "url": program_url, "name": program_name})
+    return {"items": all_programs, "nodes": len(programs)}
+
+@instrumented("programs")
+def get_all_programs(channel: ChannelConfig,
+                     max_empty_pages: int = 2,
+                     pool: Optional[ThreadPoolExecutor] = None,
+                     failed_pages: Optional[List[int]] = None) -> List[Dict[str, str]]:
+    key = f"{channel.name}:discover/a-z"
+    all_programs = paginate(lambda page: get_single_program_page(channel, page),
+                            f"{channel.name}:discover", key,
+                            pool=pool, max_failed_pages=max_empty_pages, failed_pages=failed_pages)
+    log.info("[%s] Toplam sayfa: %d", channel.name, PAGINATION.known_pages(key))
+    return all_programs
+
+@instrumented("program_id")
+def get_program_id(channel: ChannelConfig, url: str,
+                   serie_name: str = "") -> Tuple[str, List[str], Optional[List[Dict[str, str]]]]:
+    """
+    Program sayfasını tek geçişte okur: (program ID, sezonlar, gömülü bölümler).
+    Sayfa seçili sezonun ilk bölüm sayfasını da içeriyorsa (section.episodes) bu
+    bölümler ayrıştırılıp döndürülür; tüm bağlantılar bu programın adresi altında ve
+    seçili sezona aitse (<program>/sezon-N/...) o sezonun 0. sayfası olarak kullanılır,
+    aksi halde None.
+    """
+    extracted = get_extracted_from_get(url, lambda soup: _program_page_summary(url, soup), "program_id",
+                                       parse_only=PROGRAM_PAGE_STRAINER, **channel.request_options)
+    if not extracted:
+        return "0", [], None
+    embedded = extracted["embedded"]
+    if embedded is not None:
+        embedded = _named_episodes(embedded["items"], embedded["nodes"], serie_name)
+    return extracted["program_id"], extracted["seasons"], embedded
+
+def _program_page_summary(url: str, soup) -> Dict[str, Any]:
+    """Program sayfasının önbelleğe yazılabilir özeti (bölüm adları programa göre sonradan kurulur)."""
+    season_list: List[str] = []
+    dyn_link = soup.find("a", {"class": "dyn-link"})
+    program_id = safe_soup_get(lambda: dyn_link.get("data-program-id"), "0")
+    season_selector = soup.find("select", {"class": "custom-dropdown"})
+    selected = None
+    if season_selector:
+        for opt in season_selector.find_all("option"):
+            val = safe_soup_get(lambda: opt.get("value"), None)
+            if val and val not in season_list:
+                season_list.append(val)
+            if val and opt.has_attr("selected") and selected is None:
+                selected = val
+
+    embedded = None
+    section = soup.find("section", class_="episodes")
+    if section and season_list:
+        items = _episode_rows(section.find_all("div", {"class": "item"}))
+        season = selected or season_list[0]
+        prefix = urlsplit(url).path.rstrip("/") + f"/sezon-{season}/"
+        if items["items"] and all(urlsplit(urljoin(url, ep["url"])).path.startswith(prefix)
+                                  for ep in items["items"]):
+            embedded = items
+    return {"program_id": program_id, "seasons": season_list, "embedded": embedded}
+
+def _episode_rows(items) -> Dict[str, Any]:
+    """Bölüm düğümlerinin önbelleğe yazılabilir özeti: {"items": [{title, img, url}], "nodes": n}."""
+    rows: List[Dict[str, str]] = []
+    for it in items:
+        strong = it.find("strong")
+        img_tag = it.find("img")
+        a = it.find("a")
+        ep_title = safe_soup_get(lambda: strong.get_text().strip(), "Bölüm")
+        img = safe_soup_get(lambda: img_tag.get("src"), "")
+        url = safe_soup_get(lambda: a.get("href"), "")
+        if url:
+            rows.append({"title": ep_title, "img": img, "url": url})
+    return {"items": rows, "nodes": len(items)}
+
+def _named_episodes(rows: List[Dict[str, str]], nodes: int, serie_name: str) -> List[Dict[str, str]]:
+    return PageItems([{"name": f"{serie_name} - {row['title']}", "img": row["img"], "url": row["url"]}
+                      for row in rows], nodes)
+
+@instrumented("episodes.page")
+def parse_episodes_page(channel: ChannelConfig, program_id: str, page: int, season: str,
+                        serie_name: str) -> Optional[List[Dict[str, str]]]:
+    data = {"type": "episodes", "program_id": program_id, "page": page, "season": season}
+    extracted = get_extracted_from_post(channel.ajax_url, data,
+                                        lambda soup: _episode_rows(soup.find_all("div", {"class": "item"})),
+                                        "episodes.page", **channel.request_options)
+    if not extracted:
+        return None
+    return _named_episodes(extracted["items"], extracted["nodes"], serie_name)
+
+_season_lock = threading.Lock()
+_season_pool: Optional[ThreadPoolExecutor] = None
+
+def _season_executor() -> ThreadPoolExecutor:
+    """
+    Sezon sayfalaması görevleri (her sezon kendi sayfalarını sırayla gezer). Bu görevler
+    yalnızca bölüm havuzundaki sayfa isteklerini bekler: program → sezon → bölüm zinciri
+    tek yönlüdür, kilitlenme olmaz.
+    """
+    global _season_pool
+    with _season_lock:
+        if _season_pool is None:
+            _season_pool = ThreadPoolExecutor(max_workers=max(2, net.MAX_WORKERS * 2), thread_name_prefix="sezon")
+        return _season_pool
+
+def close_season_pool() -> None:
+    global _season_pool
+    with _season_lock:
+        pool, _season_pool = _season_pool, None
+    if pool:
+        pool.shutdown()
+
+@instrumented("episodes")
+def get_episodes_by_program_id(channel: ChannelConfig, program_id: str, season_list: List[str],
+                               serie_name: str,
+                               pool: Optional[ThreadPoolExecutor] = None,
+                               embedded: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+    """
+    Sezonlar birlikte gezilir:
+    1. Tüm sezonların 0. sayfası aynı anda istenir (program sayfasına gömülü
+       bölümler seçili sezonun 0. sayfası yerine geçer, tam sayfaysa).
+    2. Eski sezonlarda parmak izi SEASONS'taki kayıtla aynıysa kayıtlı liste
+       kullanılır (en yeni sezon her zaman baştan sona gezilir).
+    3. Kalan sezonların bilinen sayfaları hep birlikte kuyruğa girer; her sezonun
+       sayfalaması (bilinen aralığın ötesi dahil) ayrı bir sezon görevinde yürür,
+       sezon içindeki sayfalar sırayla tüketilir.
+    Sezon görevleri yalnızca `pool`'u bekler, `pool`'daki görevler başka görev
+    beklemez (kilitlenme yok). Programın süresi en uzun sezonu kadardır; sonuçlar
+    sezon sırasıyla birleştirilir.
+    Sonuç tekilleştirilmiş ve (sezon, bölüm) sırasına dizilmiştir (index_episodes).
+    """
+    kind = f"{channel.name}:episodes"
+    newest = _newest_season(season_list)
+    fetchers = {
+        season: (lambda page, season=season: parse_episodes_page(channel, program_id, page, season, serie_name))
+        for season in season_list
+    }
+    keys = {season: f"{channel.name}:{program_id}/{season}" for season in season_list}
+
+    firsts: Dict[str, Optional[List[Dict[str, str]]]] = {}
+    if embedded and season_list and page_nodes(embedded) >= PAGINATION.page_size(kind) > 0:
+        embedded_season = next((s for s in season_list if f"/sezon-{s}/" in embedded[0]["url"]), None)
+        if embedded_season is not None:
+            firsts[embedded_season] = embedded
+    missing = [season for season in season_list if season not in firsts]
+    fetched = pool.map(lambda season: fetchers[season](0), missing) if pool else map(
+        lambda season: fetchers[season](0), missing)
+    firsts.update(zip(missing, fetched))
+
+    results: Dict[str, List[Dict[str, str]]] = {}
+    fingerprints: Dict[str, str] = {}
+    for season in season_list:
+        first = firsts[season]
+        if season == newest or first is None:
+            continue
+        fingerprints[season] = _season_fingerprint(serie_name, first)
+        stored = SEASONS.get(keys[season], fingerprints[season])
+        if stored is not None:
+            results[season] = stored
+
+    remaining = [season for season in season_list if season not in results]
+    prefetched = {
+        season: prefetch_pages(fetchers[season], keys[season], pool, start=0 if firsts[season] is None else 1)
+        for season in remaining
+    }
+
+    def walk(season: str) -> List[Dict[str, str]]:
+        failed: List[int] = []
+        episodes = paginate(fetchers[season], kind, keys[season], pool=pool, first_page=firsts[season],
+                            failed_pages=failed, prefetched=prefetched[season])
+        if season in fingerprints and episodes and not failed:
+            SEASONS.put(keys[season], fingerprints[season], episodes)
+        return episodes
+
+    if pool and len(remaining) > 1:
+        results.update(zip(remaining, _season_executor().map(walk, remaining)))
+    else:
+        for season in tqdm(remaining, desc="Sezonlar", leave=False, disable=net.MAX_WORKERS > 1):
+            results[season] = walk(season)
+
+    return index_episodes(serie_name, [(season, results[season]) for season in season_list])
+
+def canonical_episode_url(url: str) -> str:
+    """Tekrar tespiti için: şema/host küçük harf, parça (#) ve sondaki / atılır."""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+def _episode_order(serie_name: str, season: str, ep: Dict[str, str]) -> Tuple[float, float]:
+    """(sezon, bölüm) numarası: önce <strong> başlığından, yoksa URL'den, sezon için son çare sayfanın sezonu."""
+    name = ep.get("name") or ""
+    title = name[len(serie_name) + 3:] if name.startswith(serie_name + " - ") else name
+    path = urlsplit(ep.get("url") or "").path
+
+    def number(*candidates: Optional["re.Match[str]"]) -> float:
+        for match in candidates:
+            if match:
+                return float(match.group(1))
+        return float("inf")
+
+    season_number = number(_SEASON_TITLE_RE.search(title), _SEASON_URL_RE.search(path),
+                           re.fullmatch(r"(\d+)", season or ""))
+    return season_number, number(_EPISODE_TITLE_RE.search(title), _EPISODE_URL_RE.search(path))
+
+def _known(number: float) -> int:
+    return int(number) if number != float("inf") else 0
+
+def index_episodes(serie_name: str,
+                   pages: Sequence[Tuple[str, List[Dict[str, str]]]]) -> List[Dict[str, str]]:
+    """
+    Sezon sayfalarından gelen bölümleri kanonik URL'ye göre tekilleştirir (üst üste
+    binen sayfalar, birden çok sezonda listelenen bölüm) ve (sezon, bölüm)
+    numarasına göre artan sırada döndürür. Numarası çıkarılamayan bölümler
+    sezonlarının sonunda, geliş sırasıyla kalır.
+    """
+    index: Dict[str, Tuple[Tuple[float, float], int, Dict[str, str]]] = {}
+    for season, episodes in pages:
+        for ep in episodes:
+            key = canonical_episode_url(ep["url"])
+            if key not in index:
+                index[key] = (_episode_order(serie_name, season, ep), len(index), ep)
+    dropped = sum(len(episodes) for _, episodes in pages) - len(index)
+    if dropped:
+        log.info("%s: %d tekrarlanan bölüm atlandı", serie_name, dropped)
+    return [ep for _, _, ep in sorted(index.values(), key=lambda entry: entry[:2])]
+
+def _newest_season(season_list: List[str]) -> Optional[str]:
+    """Sayısal en büyük sezon (sayfa sırası değişse de); sayısal değilse listedeki ilk sezon."""
+    numeric = [season for season in season_list if season.isdigit()]
+    if numeric:
+        return max(numeric, key=int)
+    return season_list[0] if season_list else None
+
+def _season_fingerprint(serie_name: str, first_page: List[Dict[str, str]]) -> str:
+    keys = "\n".join([serie_name] + [ep.get("url", "") for ep in first_page])
+    return hashlib.sha1(keys.encode("utf-8")).hexdigest()[:16]
+
+@instrumented("reference_id")
+def get_reference_id(channel: ChannelConfig, episode_url: str) -> Optional[str]:
+    content = get_content_from_get(episode_url, **channel.request_options)
+    if content is None:
+        return None
+    with TELEMETRY.parsing():
+        reference_id = scan_video_code(content)
+    if reference_id is None:
+        # Ön tarama etiketi bulamadı (farklı işaretleme vb.): süzgeçli ayrıştırmaya düş
+        soup = make_soup(content, VIDEO_PLAYER_STRAINER)
+        player_div = soup.find("div", {"class": "video-player"})
+        reference_id = safe_soup_get(lambda: player_div.get("data-video-code"), None)
+    return reference_id or None
+
+def get_stream_urls(channel: ChannelConfig, episode_url: str) -> List[str]:
+    reference_id = get_reference_id(channel, episode_url)
+    if not reference_id:
+        return []
+    return build_candidate_stream_urls(channel, reference_id)
+
+def resolve_reference_ids(channel: ChannelConfig,
+                          episodes: List[Dict[str, str]],
+                          episode_pool: ThreadPoolExecutor,
+                          serie_name: str = "") -> List[Optional[str]]:
+    """
+    Bölümlerin ReferenceId'lerini sırayla döndürür. Önbellekte taze olanlar için
+    oynatıcı sayfası çekilmez; önbellekte hiç kaydı olmayanlar için önce son M3U
+    listesindeki ReferenceId (SEED) denenir; kalanlar `episode_pool` üzerinde
+    eşzamanlı çekilir. Yeniden doğrulama başarısız olursa eski (süresi dolmuş) değer kullanılır.
+    """
+    refs = [REFERENCE_CACHE.get(ep["url"]) for ep in episodes]
+    for i, ep in enumerate(episodes):
+        if refs[i] is None and REFERENCE_CACHE.get(ep["url"], allow_stale=True) is None:
+            seeded = SEED.get(channel.name, serie_name, ep["name"])
+            if seeded is not None and seeded.reference_id:
+                REFERENCE_CACHE.put(ep["url"], seeded.reference_id)
+                refs[i] = seeded.reference_id
+    missing = [i for i, ref in enumerate(refs) if ref is None]
+    fetched = episode_pool.map(lambda url: get_reference_id(channel, url),
+                               [episodes[i]["url"] for i in missing])
+    for i, ref in zip(missing, fetched):
+        url = episodes[i]["url"]
+        if ref:
+            REFERENCE_CACHE.put(url, ref)
+        else:
+            ref = REFERENCE_CACHE.get(url, allow_stale=True)
+        refs[i] = ref
+    return refs
+
+@instrumented("streams")
+def select_stream_urls(channel: ChannelConfig,
+                       program_url: str,
+                       candidate_lists: List[List[str]],
+                       episode_pool: ThreadPoolExecutor) -> List[Optional[str]]:
+    """
+    Her bölüm için kullanılacak yayın URL'sini sırayla döndürür. Doğrulama kapalıysa
+    ilk aday; açıksa STREAM_VALIDATOR'ın seçtiği çalışan aday (yoksa None).
+    İlk bölüm programın kazanan PublisherId'sini belirler, kalanlar önce onu dener.
+    HLS_RESOLVER açıksa seçilen redirect adresi son HLS master adresiyle değiştirilir.
+    """
+    if not STREAM_VALIDATOR.enabled or not candidate_lists:
+        chosen = [cands[0] if cands else None for cands in candidate_lists]
+    else:
+        labeled = [list(zip(map(str, channel.publisher_ids), cands)) for cands in candidate_lists]
+        first = STREAM_VALIDATOR.choose(program_url, labeled[0])
+        chosen = [first, *episode_pool.map(lambda cands: STREAM_VALIDATOR.choose(program_url, cands), labeled[1:])]
+    if not HLS_RESOLVER.enabled:
+        return chosen
+    return list(episode_pool.map(lambda url: HLS_RESOLVER.resolve(url) if url else None, chosen))
+
+def process_program(channel: ChannelConfig, program: Dict[str, str],
+                    episode_pool: ThreadPoolExecutor) -> Optional[Program]:
+    """
+    Tek bir programı işler: program sayfası → sezon/bölüm sayfaları → oynatıcı sayfaları.
+    Bölümler URL'ye (index_episodes) ve ReferenceId'ye göre tekilleştirilir.
+    Program sayfasından sonra SCHEDULE.due() sorulur; durgun program atlanır ("skipped" kaydı).
+    Önbellekte olmayan bölümlerin oynatıcı sayfaları `episode_pool` üzerinde
+    eşzamanlı çekilir; sonuçlar `map` ile alındığı için bölüm sırası korunur.
+    """
+    program_id, season_list, embedded = get_program_id(channel, program["url"], program["name"])
+    if program_id == "0":
+        log.warning("[%s] Program ID alınamadı: %s", channel.name, program.get("name"))
+        return None
+    if not SCHEDULE.due(program["url"], _newest_season(season_list)):
+        log.info("[%s] Durgun program, bu çalıştırmada atlandı: %s", channel.name, program.get("name"))
+        return skipped(program["url"], program.get("name", ""))
+
+    episodes = get_episodes_by_program_id(channel, program_id, season_list, program["name"],
+                                          pool=episode_pool, embedded=embedded)
+    if not episodes:
+        return None
+
+    result = Program(name=program["name"], url=program["url"], img=program.get("img", ""))
+
+    reference_ids = resolve_reference_ids(channel, episodes, episode_pool, program["name"])
+    # Farklı URL'lerden aynı videoya (ReferenceId) varılırsa yalnızca ilk bölüm kalır.
+    seen_references = set()
+    resolved = []
+    for ep, reference_id in zip(episodes, reference_ids):
+        if reference_id and reference_id not in seen_references:
+            seen_references.add(reference_id)
+            resolved.append((ep, reference_id, build_candidate_stream_urls(channel, reference_id)))
+    stream_urls = select_stream_urls(channel, program["url"], [cands for _, _, cands in resolved], episode_pool)
+
+    for (ep, reference_id, candidates), stream_url in tqdm(zip(resolved, stream_urls), total=len(resolved),
+                                                           desc="Bölümler", leave=False,
+                                                           disable=net.MAX_WORKERS > 1):
+        if not stream_url:
+            continue
+        # Aday adreslerden biriyse yalnızca PublisherId saklanır; çözülmüş HLS adresi olduğu gibi.
+        season, number = _episode_order(program["name"], "", ep)
+        episode = Episode(name=ep["name"], img=ep.get("img", ""), url=ep["url"], reference_id=reference_id,
+                          season=_known(season), number=_known(number))
+        if stream_url in candidates:
+            episode.publisher = channel.publisher_ids[candidates.index(stream_url)]
+        else:
+            episode.stream = stream_url
+        result.episodes.append(episode)
+
+    return result if result.episodes else None
+
+def run(channel: ChannelConfig,
+        program_pool: ThreadPoolExecutor,
+        episode_pool: ThreadPoolExecutor,
+        start: int = 0, end: int = 0,
+        sink: Optional[Callable[[Program, int], None]] = None,
+        checkpoint: Optional[CheckpointJournal] = None,
+        shard: Tuple[int, int] = (0, 1)) -> Dict[str, Any]:
+    """
+    Programlar ve bölümler ayrı havuzlarda işlenir: program işçileri yalnızca bölüm
+    havuzunu beklediği için kilitlenme olmaz. Programlar SCHEDULE.order() sırasıyla
+    kuyruğa girer, sonuçlar bitiş sırasıyla alınır. Havuzlar kanallar arasında paylaşılır.
+    `sink` verilirse her program tamamlandığı anda sink(program, A–Z indeksi) ile
+    aktarılır ve bellekte biriktirilmez (birleşik listenin A–Z sırasını yazıcı kurar);
+    dönen sözlükteki liste boş kalır. sink yoksa liste A–Z sırasındadır.
+    `checkpoint` verilirse tamamlanan programlar günlüğe yazılır; günlükte bulunan
+    programlar yeniden çekilmez, kayıtlı sonuçları aynı sırayla çıktıya katılır.
+    `shard=(i, N)` → aralıktaki programlardan yalnızca shard_of(URL, N) == i olanlar
+    işlenir (çıktı ve birleştirme yine indeks sırasıyladır).
+    A–Z listesi hiç alınamazsa RuntimeError (tarama başarısız sayılır, listeler korunur);
+    bazı sayfaları alınamadıysa dönen sözlükte "complete" False olur (kaçırma sayılmaz).
+    "listed" A–Z listesindeki tüm program URL'leridir (reconcile: listede olup
+    taranamayan program kaçırma sayılmaz).
+    """
+    failed_pages: List[int] = []
+    programs_list = get_all_programs(channel, pool=episode_pool, failed_pages=failed_pages)
+    if not programs_list:
+        raise RuntimeError(f"[{channel.name}] Program listesi alınamadı (A–Z boş)")
+    if failed_pages:
+        log.warning("[%s] A–Z listesinin %d sayfası alınamadı; gelmeyen programlar kaçırma sayılmayacak.",
+                    channel.name, len(failed_pages))
+
+    end_index = len(programs_list) if end == 0 else min(end, len(programs_list))
+    start_index = max(0, start)
+
+    def _process(i: int) -> Optional[Program]:
+        program = programs_list[i]
+        if checkpoint is not None:
+            saved = checkpoint.get(i, program["url"])
+            if saved:
+                log.info("[%s] %d | %s (kontrol noktasından)", channel.name, i, program.get("name", ""))
+                return Program.from_dict(saved)
+        log.info("[%s] %d | %s", channel.name, i, program.get("name", ""))
+        result = process_program(channel, program, episode_pool)
+        SCHEDULE.observe(program["url"], result)
+        if checkpoint is not None and result:
+            checkpoint.record(i, program["url"], result.to_dict())
+        return result
+
+    shard_index, shard_count = shard
+    indices = [i for i in range(start_index, end_index)
+               if shard_count == 1 or shard_of(programs_list[i]["url"], shard_count) == shard_index]
+    # Öncelikli programlar önce işlenir ve bittikleri anda yazılır; zaman aşımında
+    # yarım kalan A–Z öneki değil, plandaki sıranın kuyruğu olur.
+    order = SCHEDULE.order(indices, [p["url"] for p in programs_list])
+    results: Dict[int, Program] = {}
+    for i, result in tqdm(completed(program_pool, _process, order), total=len(order),
+                          desc=f"Programlar ({channel.name})"):
+        if result is None:
+            continue
+        if sink:
+            sink(result, i)
+        elif not result.skipped:
+            results[i] = result
+    output = [results[i] for i in sorted(results)]
+
+    return {"programs": output, "complete": not failed_pages, "listed": [p["url"] for p in programs_list]}
+
+def open_writer(channel: ChannelConfig, catalog: Optional[str] = None) -> M3UStreamWriter:
+    """
+    JSON YAZMAZ. Sadece M3U dosyaları üretir (programlar tamamlandıkça):
+      - <output_dir>/<all_m3u_name>.m3u
+      - <output_dir>/programlar/<dizi-adi>.m3u
+      - (series_master=True ise) <output_dir>/programlar/0.m3u
+      - <output_dir>/changes.json (önceki listelere göre eklenen / silinen / değişen bölümler)
+      - <output_dir>/playlists.json (reconcile() durumu: art arda kaçırılan tarama sayıları)
+      - (catalog="jsonl"|"sqlite" ise) <output_dir>/catalog.jsonl | catalog.sqlite
+    İçeriği değişmeyen dosyalara dokunulmaz.
+    """
+    all_path = os.path.join(channel.output_dir, f"{channel.all_m3u_name}.m3u") if channel.all_m3u_name else None
+    return M3UStreamWriter([channel.series_dir], all_path=all_path, master=channel.series_master,
+                           manifest_path=os.path.join(channel.output_dir, CHANGES_NAME),
+                           state_path=os.path.join(channel.output_dir, PLAYLISTS_NAME),
+                           catalog=open_catalog(channel.output_dir, catalog))
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+"""
+Kanal D dizi scraper
+- channel.series_urls + channel.series_file (örn. KanalD/diziler.txt) içindeki diziler
+  eşzamanlı işlenir: her dizinin bölüm listesi (bolumler?p=N) gezilir, bölümlerin
+  media ID'leri actions/media API'si ile HLS URL'sine çevrilir (MEDIA_CACHE).
+- Çıktılar:
+  - <output_dir>/<dizi-adi>.m3u
+  - <output_dir>/programlar/<dizi-adi>.m3u
+  - <output_dir>/<all_m3u_name>.m3u (tüm diziler)
+"""
+
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Any, Optional, Callable
+from urllib.parse import urljoin
+
+import requests
+from tqdm import tqdm
+
+from .cache import MEDIA_CACHE, SEED, CheckpointJournal, shard_of
+from .catalog import open_catalog
+from .channels import ChannelConfig
+from .m3u import M3UStreamWriter, CHANGES_NAME, PLAYLISTS_NAME
+from .models import Program, Episode
+from .net import SESSION, RATE_LIMITER, log, get_extracted_from_get
+from .schedule import SCHEDULE, skipped, completed
+from .telemetry import instrumented
+
+def get_series_urls(channel: ChannelConfig) -> List[str]:
+    """channel.series_urls ve channel.series_file'daki diziler (sıralı, tekrarsız)."""
+    entries = list(channel.series_urls)
+    if channel.series_file and os.path.exists(channel.series_file):
+        with open(channel.series_file, encoding="utf-8") as f:
+            entries += [line.strip() for line in f]
+    urls: List[str] = []
+    for entry in entries:
+        if not entry or entry.startswith("#"):
+            continue
+        url = urljoin(channel.base_url, entry)
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+@instrumented("series_info")
+def get_series_info(channel: ChannelConfig, series_url: str) -> Optional[Dict[str, str]]:
+    """Verilen dizi URL'sinden temel bilgileri (isim, poster) alır."""
+    log.info("[%s] Dizi bilgileri alınıyor: %s", channel.name, series_url)
+    info = get_extracted_from_get(series_url, _series_summary, "series_info", **channel.request_options)
+    if not info:
+        return None
+    return {"name": info["name"], "url": series_url, "img": urljoin(channel.base_url, info["img"])}
+
+def _series_summary(soup) -> Dict[str, str]:
+    name_tag = soup.select_one("h1.title")
+    name = name_tag.get_text(strip=True) if name_tag else "İsimsiz Dizi"
+
+    img_tag = soup.select_one("div.poster img.desktop-poster")
+    img = img_tag.get("data-src") or img_tag.get("src") if img_tag else ""
+    return {"name": name, "img": img}
+
+def _episode_rows(soup) -> Dict[str, Any]:
+    """Bölüm sayfasının önbelleğe yazılabilir özeti: {"items": [...], "nodes": ham düğüm sayısı}."""
+    rows: List[Dict[str, str]] = []
+    episode_items = soup.select("div.episode-item a")
+    for item in episode_items:
+        media_id = item.get("data-media-id")
+        if not media_id: continue
+        title_tag = item.select_one(".title")
+        title = title_tag.get_text(strip=True) if title_tag else "Bölüm"
+        img_tag = item.select_one("img.desktop-poster")
+        img = img_tag.get("data-src") or img_tag.get("src") if img_tag else ""
+        rows.append({"name": title, "media_id": media_id, "img": img})
+    return {"items": rows, "nodes": len(episode_items)}
+
+@instrumented("series_episodes")
+def get_all_episodes_for_series(channel: ChannelConfig, series_url: str) -> List[Dict[str, str]]:
+    """Bir dizinin tüm bölümlerini ve video ID'lerini çeker (aynı media ID bir kez)."""
+    all_episodes: List[Dict[str, str]] = []
+    seen_media = set()
+    episodes_url = urljoin(series_url.rstrip('/') + '/', "bolumler")
+
+    page = 1
+    while True:
+        paginated_url = f"{episodes_url}?p={page}"
+        extracted = get_extracted_from_get(paginated_url, _episode_rows, "series_episodes", **channel.request_options)
+        if not extracted or not extracted["nodes"]: break
+
+        for row in extracted["items"]:
+            if row["media_id"] in seen_media: continue
+            seen_media.add(row["media_id"])
+            all_episodes.append({**row, "img": urljoin(channel.base_url, row["img"])})
+
+        page += 1
+
+    return all_episodes
+
+@instrumented("media")
+def get_stream_url_from_media_id(channel: ChannelConfig, media_id: str) -> Optional[str]:
+    """Taze önbellek kaydı varsa API'ye gitmez; API başarısız olursa eski kayda düşer."""
+    cache_key = f"{channel.name}:{media_id}"
+    stream_url = MEDIA_CACHE.get(cache_key)
+    if stream_url:
+        return stream_url
+    stream_url = _fetch_stream_url(channel, media_id)
+    if stream_url:
+        MEDIA_CACHE.put(cache_key, stream_url)
+        return stream_url
+    return MEDIA_CACHE.get(cache_key, allow_stale=True)
+
+def _fetch_stream_url(channel: ChannelConfig, media_id: str) -> Optional[str]:
+    vod_api_url = urljoin(channel.base_url, "actions/media")
+    options = channel.request_options
+    headers = dict(options["headers"], **{"X-Requested-With": "XMLHttpRequest"})
+    RATE_LIMITER.wait(vod_api_url)
+    try:
+        payload = {"id": media_id}
+        r = SESSION.post(vod_api_url, data=payload, timeout=options["timeout"], headers=headers)
+        r.raise_for_status()
+        data = r.json()
+        if data.get("status") == "success" and "media" in data:
+            for file in data["media"].get("files", []):
+                if file.get("type") == "application/x-mpegURL":
+                    return file.get("url")
+        return None
+    except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+        log.error("[%s] Media ID %s için stream URL alınırken hata: %s", channel.name, media_id, e)
+        return None
+
+def process_series(channel: ChannelConfig, series_url: str,
+                   episode_pool: ThreadPoolExecutor) -> Optional[Program]:
+    """
+    Tek bir dizinin bilgilerini, bölümlerini ve stream URL'lerini toplar.
+    actions/media istekleri `episode_pool` üzerinde eşzamanlı gönderilir (pencere =
+    havuz boyutu, hız RATE_LIMITER ile sınırlı; 429/5xx yanıtları SESSION'ın Retry
+    ayarıyla Retry-After'a uyarak üstel beklemeyle yeniden denenir). `map` sırayı korur.
+    SCHEDULE.due() False ise dizi hiç çekilmez ("skipped" kaydı; son sağlam liste korunur).
+    Önbellekte hiç kaydı olmayan bölümler için son M3U listesindeki adres (SEED) kullanılır.
+    """
+    if not SCHEDULE.due(series_url):
+        log.info("[%s] Durgun dizi, bu çalıştırmada atlandı: %s", channel.name, series_url)
+        return skipped(series_url)
+    series_info = get_series_info(channel, series_url)
+    if not series_info:
+        log.error("[%s] Dizi bilgileri alınamadı: %s", channel.name, series_url)
+        return None
+
+    log.info("[%s] İşleniyor: %s", channel.name, series_info.get("name", ""))
+    episodes = get_all_episodes_for_series(channel, series_info["url"])
+    if not episodes:
+        log.warning("[%s] %s için hiç bölüm bulunamadı.", channel.name, series_info.get("name"))
+        return None
+
+    series_data = Program(name=series_info["name"], url=series_info["url"], img=series_info["img"])
+
+    for ep in episodes:
+        cache_key = f"{channel.name}:{ep['media_id']}"
+        if MEDIA_CACHE.get(cache_key, allow_stale=True) is None:
+            seeded = SEED.get(channel.name, series_info["name"], ep["name"])
+            if seeded is not None and seeded.stream:
+                MEDIA_CACHE.put(cache_key, seeded.stream)
+
+    stream_urls = episode_pool.map(lambda ep: get_stream_url_from_media_id(channel, ep["media_id"]), episodes)
+    for ep, stream_url in tqdm(zip(episodes, stream_urls), total=len(episodes),
+                               desc=f"Bölümler ({series_info['name']})"):
+        if stream_url:
+            series_data.episodes.append(Episode(name=ep["name"], img=ep.get("img", ""),
+                                                reference_id=ep["media_id"], stream=stream_url))
+
+    if not series_data.episodes:
+        log.warning("[%s] Hiçbir bölüm için stream URL'si alınamadı.", channel.name)
+        return None
+    return series_data
+
+def run(channel: ChannelConfig,
+        program_pool: ThreadPoolExecutor,
+        episode_pool: ThreadPoolExecutor,
+        start: int = 0, end: int = 0,
+        sink: Optional[Callable[[Program, int], None]] = None,
+        checkpoint: Optional[CheckpointJournal] = None,
+        shard: Tuple[int, int] = (0, 1)) -> Dict[str, Any]:
+    """
+    get_series_urls() dizilerini işler (start/end dizi indeks aralığıdır). Diziler
+    `program_pool`'a SCHEDULE.order() sırasıyla girer, bölümlerin media istekleri
+    `episode_pool` üzerinde eşzamanlı çalışır; sonuçlar bitiş sırasıyla alınır.
+    `sink` verilirse her dizi tamamlandığında sink(dizi, indeks) ile aktarılır ve
+    bellekte tutulmaz; sink yoksa liste dizi sırasındadır.
+    `checkpoint` verilirse günlükte bulunan diziler yeniden çekilmez.
+    `shard=(i, N)` → yalnızca shard_of(URL, N) == i olan diziler işlenir.
+    """
+    series_urls = get_series_urls(channel)
+    if not series_urls:
+        raise RuntimeError(f"[{channel.name}] Taranacak dizi yok")
+
+    end_index = len(series_urls) if end == 0 else min(end, len(series_urls))
+    shard_index, shard_count = shard
+    indices = [i for i in range(max(0, start), end_index)
+               if shard_count == 1 or shard_of(series_urls[i], shard_count) == shard_index]
+
+    def _process(i: int) -> Optional[Program]:
+        series_url = series_urls[i]
+        if checkpoint is not None:
+            saved = checkpoint.get(i, series_url)
+            if saved:
+                log.info("[%s] %s (kontrol noktasından)", channel.name, saved.get("name", ""))
+                return Program.from_dict(saved)
+        result = process_series(channel, series_url, episode_pool)
+        SCHEDULE.observe(series_url, result)
+        if checkpoint is not None and result:
+            checkpoint.record(i, series_url, result.to_dict())
+        return result
+
+    results: Dict[int, Program] = {}
+    for i, series_data in completed(program_pool, _process, SCHEDULE.order(indices, series_urls)):
+        if not series_data:
+            continue
+        if sink:
+            sink(series_data, i)
+        elif not series_data.skipped:
+            results[i] = series_data
+    output = [results[i] for i in sorted(results)]
+    return {"programs": output, "complete": True, "listed": list(series_urls)}
+
+def open_writer(channel: ChannelConfig, catalog: Optional[str] = None) -> M3UStreamWriter:
+    # Hem ana klasöre hem de /programlar klasörüne aynı M3U'yu yaz; tüm diziler <all_m3u_name>.m3u'da
+    all_path = os.path.join(channel.output_dir, f"{channel.all_m3u_name}.m3u") if channel.all_m3u_name else None
+    return M3UStreamWriter([channel.output_dir, channel.series_dir], all_path=all_path,
+                           manifest_path=os.path.join(channel.output_dir, CHANGES_NAME),
+                           state_path=os.path.join(channel.output_dir, PLAYLISTS_NAME),
+                           catalog=open_catalog(channel.output_dir, catalog))
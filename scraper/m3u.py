@@ -0,0 +1,539 @@
+# -*- coding: utf-8 -*-
+
+"""
+M3U yardımcıları (tüm kanallar için ortak)
+- M3UStreamWriter   → programlar tamamlandıkça yazar (tarama sırasında kullanılır)
+- create_single_m3u → tüm dizilerin tüm bölümleri tek dosyada (örn. DMAX/DMAX.m3u)
+- create_m3us       → her dizi için ayrı dosya (örn. DMAX/programlar/<dizi>.m3u)
+Kayıtlar models.Program / Episode'dır (eski biçimdeki sözlükler de kabul edilir);
+yayın adresleri satır yazılırken üretilir. read_m3u / iter_programs yazılmış listeleri akış halinde aynı kayıtlara geri okur.
+İçeriği değişmeyen dosyalar yeniden yazılmaz; değişen bölümler changes.json'a dökülür.
+Taramada çıkmayan programların son sağlam listeleri korunur, art arda GC_AFTER_MISSES
+tam taramada çıkmazlarsa silinir (playlists.json); tek taramada silinebilecek liste
+sayısı sınırlıdır (GC_MAX_FRACTION). `catalog` verilirse (catalog.py)
+yazılan / korunan her program aynı geçişte kataloğa da işlenir.
+"""
+
+import os
+import re
+import json
+import dataclasses
+from typing import List, Tuple, Dict, Any, Optional, Sequence, Set, Union, Iterable, Iterator
+
+from slugify import slugify
+
+from .models import Program, Episode
+from .telemetry import instrumented
+
+CHANGES_NAME = "changes.json"  # program başına eklenen / silinen / değişen bölümler
+PLAYLISTS_NAME = "playlists.json"  # yazılan dizi listeleri ve art arda kaç taramada çıkmadıkları
+GC_AFTER_MISSES = 3
+GC_MAX_FRACTION = 0.2   # bir taramada listelerin en fazla bu oranı silinir (en az GC_MAX_MIN);
+GC_MAX_MIN = 5          # daha fazlası keşif/site sorunu sayılır, hiçbiri silinmez
+
+def _ensure_dir(path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+
+def _atomic_write(path: str, text: str) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def _write_if_changed(path: str, text: str, old: Optional[str] = None) -> bool:
+    """İçerik diskteki ile aynıysa dokunmaz (mtime ve git nesnesi değişmez). Yazdıysa True."""
+    if old is None:
+        old = _read_text(path)
+    if old == text:
+        return False
+    _atomic_write(path, text)
+    return True
+
+def _safe_series_filename(name: str) -> str:
+    return slugify((name or "dizi").lower()) + ".m3u"
+
+def _as_program(serie: Union[Program, Dict[str, Any]]) -> Program:
+    return serie if isinstance(serie, Program) else Program.from_dict(serie)
+
+def _episode_lines(serie: Program) -> List[str]:
+    """
+    Bir dizinin #EXTINF/URL satırları.
+    NOT: Bölüm satırlarında tvg-logo olarak SERİ (program) posteri kullanılır.
+    """
+    series_name = (serie.name or "Bilinmeyen Seri").strip()
+    series_logo = (serie.img or "").strip()  # seri posteri
+    group = series_name.replace('"', "'")
+
+    lines: List[str] = []
+    for ep in serie.episodes:
+        stream = ep.stream_url
+        if not stream:
+            continue
+        ep_name = ep.name or "Bölüm"
+
+        # Seri posteri yoksa son çare bölüm resmi
+        logo_for_line = series_logo or ep.img
+        lines.append(f'#EXTINF:-1 tvg-logo="{logo_for_line}" group-title="{group}",{ep_name}')
+        lines.append(stream)
+    return lines
+
+def _extinf_title(line: str) -> str:
+    """#EXTINF satırındaki bölüm adı: tırnak dışındaki ilk virgülden sonrası."""
+    quoted = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            quoted = not quoted
+        elif ch == "," and not quoted:
+            return line[i + 1:].strip()
+    return line
+
+def _episode_entries(text: str) -> Dict[str, str]:
+    """M3U metni → {bölüm adı: #EXTINF + URL satırları}; aynı adlı bölümler "ad #2" gibi ayrılır."""
+    entries: Dict[str, str] = {}
+    lines = [line for line in (text or "").splitlines() if line and line != "#EXTM3U"]
+    for extinf, url in zip(lines[::2], lines[1::2]):
+        title = base = _extinf_title(extinf)
+        n = 1
+        while title in entries:
+            n += 1
+            title = f"{base} #{n}"
+        entries[title] = extinf + "\n" + url
+    return entries
+
+def _diff_entries(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    return {
+        "added": [title for title in new if title not in old],
+        "removed": [title for title in old if title not in new],
+        "modified": [title for title in new if title in old and old[title] != new[title]],
+    }
+
+_EXTINF_RE = re.compile(r'#EXTINF:\s*-?[\d.]+((?:\s*[\w-]+="[^"]*")*)\s*,(.*)')
+_EXTINF_ATTR_RE = re.compile(r'([\w-]+)="([^"]*)"')
+
+def iter_m3u(lines: Iterable[str]) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    M3U satırlarını akış halinde okur: (group-title, tvg-logo, başlık, URL).
+    Dosya belleğe alınmaz; öznitelikler yalnızca #EXTINF satırında ayrıştırılır.
+    URL'siz #EXTINF ve #EXTINF'siz URL satırları atlanır.
+    """
+    group = logo = ""
+    title: Optional[str] = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] == "#":
+            if line.startswith("#EXTINF:"):
+                match = _EXTINF_RE.match(line)
+                title = match.group(2).strip() if match else None
+                group = logo = ""
+                for name, value in _EXTINF_ATTR_RE.findall(match.group(1) if match else ""):
+                    if name == "group-title":
+                        group = value
+                    elif name == "tvg-logo":
+                        logo = value
+            continue
+        if title is not None:
+            yield group, logo, title, line
+            title = None
+
+def iter_programs(lines: Iterable[str]) -> Iterator[Program]:
+    """
+    iter_m3u kayıtlarını ardışık group-title'a göre Program'lara toplar (M3UStreamWriter'ın
+    tersi). Tüm satırlarda aynı olan tvg-logo dizi posteridir; dygvideo redirect adresleri
+    ReferenceId + PublisherId olarak, diğerleri olduğu gibi saklanır.
+    """
+    program: Optional[Program] = None
+    logos = set()
+    for group, logo, title, url in iter_m3u(lines):
+        if program is None or group != program.name:
+            if program is not None:
+                program.img = logos.pop() if len(logos) == 1 else ""
+                yield program
+            program = Program(name=group)
+            logos = set()
+        logos.add(logo)
+        program.episodes.append(Episode.from_stream_url(title, url, img=logo))
+    if program is not None:
+        program.img = logos.pop() if len(logos) == 1 else ""
+        yield program
+
+def read_m3u(path: str) -> List[Program]:
+    """Diskteki bir .m3u dosyasını create_m3us()'un tükettiği kayıtlara geri okur (yoksa boş liste)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return list(iter_programs(f))
+    except OSError:
+        return []
+
+class M3UStreamWriter:
+    """
+    Programları tamamlandıkları anda diske yazar; tüm katalog bellekte tutulmaz.
+    - series_dirs içindeki her klasöre <dizi>.m3u → add() çağrısında hemen (atomik)
+    - all_path (opsiyonel) → <all_path>.tmp dosyasına artımlı eklenir, close()'da
+      atomik olarak yerine konur. Tarama yarıda kalırsa önceki tam liste bozulmaz,
+      o ana kadarki ilerleme .tmp dosyasında kalır. add(program, index) ile programlar
+      bitiş sırasıyla gelebilir; birleşik liste ve 0.m3u reconcile()/close()'da
+      indeks (A–Z) sırasına dizilir.
+    - master=True → series_dirs[0]/0.m3u close()'da yazılır
+    - İçeriği aynı kalan dosyalar yazılmaz (written / unchanged sayaçları).
+    - manifest_path (opsiyonel) → close()'da program başına eklenen / silinen /
+      değişen bölümler (series_dirs[0]'daki önceki dosyaya göre) JSON olarak yazılır.
+    - state_path (opsiyonel) → reconcile() ile bu taramada gelmeyen programlar
+      işlenir; durum close()'da yazılır. {"skipped": True} kayıtları (planlayıcının
+      atladığı programlar) önceki listeyle yerinde karşılanır.
+    """
+
+    def __init__(self,
+                 series_dirs: Sequence[str],
+                 all_path: Optional[str] = None,
+                 master: bool = False,
+                 base_url: str = "",
+                 manifest_path: Optional[str] = None,
+                 state_path: Optional[str] = None,
+                 catalog: Optional[Any] = None) -> None:
+        self.series_dirs = list(series_dirs)
+        for folder in self.series_dirs:
+            _ensure_dir(folder)
+        if base_url and not base_url.endswith(("/", "\\")):
+            base_url = base_url + "/"
+        self.base_url = base_url
+        self.all_path = all_path
+        self._all_file = None
+        if all_path:
+            _ensure_dir(os.path.dirname(all_path) or ".")
+            self._all_file = open(all_path + ".tmp", "w", encoding="utf-8", newline="\n")
+            self._all_file.write("#EXTM3U\n")
+        self.master = master
+        # Yazım sırasıyla (dosya adı, dizi adı, poster, birleşik listedeki [başlangıç, bitiş) bayt aralığı,
+        # A–Z indeksi); 0.m3u bundan üretilir, reconcile() korunan programları önceki yerlerine taşır.
+        self._blocks: List[Tuple[str, str, str, int, int, Optional[int]]] = []
+        self._owners: Dict[str, int] = {}  # dosya adı → dosyayı yazan programın indeksi (aynı adlılarda büyük olan)
+        self._all_size = len("#EXTM3U\n")
+        self.manifest_path = manifest_path
+        self.changes: Dict[str, Dict[str, Any]] = {}
+        self.state_path = state_path
+        self._playlists: Dict[str, Dict[str, Any]] = {}  # dosya adı → {name, url, img, misses}; yazım sırasıyla
+        self._previous = self._load_playlists() if state_path else {}
+        self._reconciled = False
+        self.catalog = catalog
+        self.programs = 0
+        self.episodes = 0
+        self.written = 0
+        self.unchanged = 0
+        self.kept = 0
+        self.removed = 0
+        self.skipped = 0
+        self.gc_blocked = 0
+
+    @instrumented("m3u")
+    def add(self, serie: Union[Program, Dict[str, Any]], index: Optional[int] = None) -> None:
+        """`index`: programın A–Z indeksi (programlar bitiş sırasıyla geliyorsa)."""
+        serie = _as_program(serie)
+        if serie.skipped:
+            self._keep(serie, index)
+            return
+        lines = _episode_lines(serie)
+        if not lines:
+            return
+        text = "\n".join(lines) + "\n"
+
+        series_name = (serie.name or "Bilinmeyen Seri").strip()
+        plist_name = _safe_series_filename(series_name)
+        series_logo = (serie.img or "").strip()
+        # Aynı adlı iki programda dosya sıralı çalıştırmadaki gibi sonrakinin (büyük indeks) olur.
+        owner = self._owners.get(plist_name)
+        if owner is None or index is None or index >= owner:
+            if index is not None:
+                self._owners[plist_name] = index
+            playlist = "#EXTM3U\n" + text
+            for i, folder in enumerate(self.series_dirs):
+                path = os.path.join(folder, plist_name)
+                old = _read_text(path)
+                if i == 0 and self.manifest_path and old != playlist:
+                    self._record_change(plist_name, series_name, old, playlist)
+                self._count(_write_if_changed(path, playlist, old))
+            if plist_name not in self._playlists or owner is not None:
+                self._playlists[plist_name] = {"name": series_name, "url": serie.url,
+                                               "img": series_logo, "misses": 0}
+        self._append_block(plist_name, series_name, series_logo, text, index)
+        if self.catalog is not None:
+            self.catalog.add(serie)
+
+        self.programs += 1
+        self.episodes += len(lines) // 2
+
+    def _append_block(self, plist_name: str, series_name: str, series_logo: str, text: str,
+                      index: Optional[int] = None) -> None:
+        start = self._all_size
+        if self._all_file and text:
+            self._all_file.write(text)
+            self._all_file.flush()
+            self._all_size += len(text.encode("utf-8"))
+        self._blocks.append((plist_name, series_name, series_logo, start, self._all_size, index))
+
+    def _keep(self, serie: Program, index: Optional[int] = None) -> None:
+        """Planlayıcının atladığı program: önceki listesi yerinde (sırası bozulmadan) kullanılır."""
+        url = serie.url
+        plist_name = next((name for name, entry in self._previous.items() if url and entry.get("url") == url),
+                          _safe_series_filename(serie.name))
+        entry = self._previous.get(plist_name)
+        old = _read_text(os.path.join(self.series_dirs[0], plist_name)) if self.series_dirs else None
+        if entry is None or old is None or plist_name in self._playlists:
+            return
+        self._append_previous(plist_name, entry, old, index)
+        self._playlists[plist_name] = dict(entry, misses=0)
+        self.skipped += 1
+        self.programs += 1
+        self.episodes += len(_episode_entries(old))
+
+    def _append_previous(self, plist_name: str, entry: Dict[str, Any], old: str,
+                         index: Optional[int] = None) -> None:
+        body = old[len("#EXTM3U\n"):] if old.startswith("#EXTM3U\n") else old
+        if body.strip() and not body.endswith("\n"):
+            body += "\n"
+        self._append_block(plist_name, entry.get("name", ""), entry.get("img", ""), body if body.strip() else "",
+                           index)
+        if self.catalog is not None:
+            self.catalog.keep(entry.get("url") or "")
+
+    def _load_playlists(self) -> Dict[str, Dict[str, Any]]:
+        """Önceki durum + durumda olmayan mevcut dizi dosyaları (ilk çalıştırma, eski artıklar)."""
+        previous: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                for entry in json.load(f).get("playlists", []):
+                    previous[entry.pop("file")] = entry
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        skip = {"0.m3u", os.path.basename(self.all_path or "")}
+        try:
+            names = sorted(os.listdir(self.series_dirs[0]))
+        except OSError:
+            names = []
+        for name in names:
+            if name.endswith(".m3u") and name not in skip and name not in previous:
+                # Durumda olmayan dosya: dizi adı ve posteri ilk satırından okunur.
+                try:
+                    with open(os.path.join(self.series_dirs[0], name), encoding="utf-8") as f:
+                        group, logo, _, _ = next(iter_m3u(f), ("", "", "", ""))
+                except OSError:
+                    group = logo = ""
+                previous[name] = {"name": group or name[:-len(".m3u")], "url": "", "img": logo, "misses": 0}
+        return previous
+
+    def reconcile(self, gc_after: int = 0, listed: Optional[Set[str]] = None) -> None:
+        """
+        Tarama bittikten sonra (close()'dan önce) çağrılır. Önceden yazılmış ama bu
+        taramada gelmeyen programlar için:
+        - dosya korunur, son sağlam içeriği birleşik listeye ve 0.m3u'ya eklenir
+          (geçici hata yüzünden liste eksilmez, yeniden çekmeye gerek kalmaz);
+        - `listed` (bu taramadaki A–Z listesinin program URL'leri) verilmişse listede
+          olan ama taranamayan program kaçırma sayılmaz (sayaç sıfırlanır); yalnızca
+          listeden düşenler sayılır;
+        - gc_after > 0 ise (tam tarama) kaçırma sayısı artar; gc_after'a ulaşınca
+          dosyalar silinir ve changes.json'a "removed" olarak yazılır.
+        gc_after = 0 (kısmi tarama: --start/--end, --series) → sayaç artmaz, silme yok.
+        Silinecek liste sayısı sınırı aşarsa hiçbiri silinmez (gc_blocked).
+        """
+        self._sort_blocks()
+        if not self.state_path or not self.series_dirs:
+            return
+        missing = []
+        for plist_name, entry in self._previous.items():
+            if plist_name in self._playlists:
+                continue
+            old = _read_text(os.path.join(self.series_dirs[0], plist_name))
+            if old is None:
+                continue  # dosya elle silinmiş; takip bırakılır
+            if listed is not None and entry.get("url") in listed:
+                misses = 0  # listede duruyor, yalnızca bu taramada alınamadı
+            else:
+                misses = int(entry.get("misses", 0)) + (1 if gc_after > 0 else 0)
+            missing.append((plist_name, entry, old, misses))
+        due = sum(1 for *_, misses in missing if gc_after > 0 and misses >= gc_after)
+        if due > max(GC_MAX_MIN, int(len(self._previous) * GC_MAX_FRACTION)):
+            self.gc_blocked = due
+            gc_after = 0
+        for plist_name, entry, old, misses in missing:
+            if gc_after > 0 and misses >= gc_after:
+                for folder in self.series_dirs:
+                    try:
+                        os.remove(os.path.join(folder, plist_name))
+                    except FileNotFoundError:
+                        pass
+                self.changes[plist_name] = {"name": entry.get("name", ""), "status": "removed", "added": [],
+                                            "removed": list(_episode_entries(old)), "modified": []}
+                self.removed += 1
+                continue
+            self._append_previous(plist_name, entry, old)
+            self._playlists[plist_name] = dict(entry, misses=misses)
+            self.kept += 1
+        kept = {plist_name for plist_name, *_ in missing if plist_name in self._playlists}
+        if kept:
+            self._restore_order(kept)
+        self._reconciled = True
+
+    def _restore_order(self, kept: Set[str]) -> None:
+        """
+        Korunan programları playlists.json'daki önceki yerlerine (önceki komşularının
+        arkasına) taşır; birleşik liste, 0.m3u ve durum dosyası bu sırayla yazılır.
+        Böylece bir gün gelmeyen program listenin sonuna gidip ertesi gün geri dönmez.
+        """
+        present = {block[0] for block in self._blocks if block[0] not in kept}
+        followers: Dict[Optional[str], List[str]] = {}
+        anchor: Optional[str] = None
+        for plist_name in self._previous:
+            if plist_name in kept:
+                followers.setdefault(anchor, []).append(plist_name)
+            elif plist_name in present:
+                anchor = plist_name
+        kept_blocks = {block[0]: block for block in self._blocks if block[0] in kept}
+        ordered = [kept_blocks[name] for name in followers.pop(None, [])]
+        for block in self._blocks:
+            if block[0] in kept:
+                continue
+            ordered.append(block)
+            ordered.extend(kept_blocks[name] for name in followers.pop(block[0], []))
+        ordered.extend(kept_blocks[name] for names in followers.values() for name in names)
+        self._reorder(ordered)
+
+    def _sort_blocks(self) -> None:
+        """Bitiş sırasıyla eklenen programları A–Z indeksine göre dizer (indekssizler sonda, sırayla)."""
+        self._reorder(sorted(self._blocks, key=lambda block: (block[5] is None, block[5] or 0)))
+
+    def _reorder(self, ordered: List[Tuple[str, str, str, int, int, Optional[int]]]) -> None:
+        """Birleşik listeyi, blokları ve durum sırasını `ordered` sırasına getirir."""
+        if ordered == self._blocks:
+            return
+        if self._all_file:
+            # Programların bayt aralıkları yeni sırayla kopyalanır (liste belleğe alınmaz).
+            self._all_file.close()
+            tmp = self.all_path + ".tmp"
+            size = len(b"#EXTM3U\n")
+            blocks = []
+            with open(tmp, "rb") as src, open(tmp + ".new", "wb") as dst:
+                dst.write(b"#EXTM3U\n")
+                for plist_name, series_name, series_logo, start, end, index in ordered:
+                    src.seek(start)
+                    dst.write(src.read(end - start))
+                    blocks.append((plist_name, series_name, series_logo, size, size + end - start, index))
+                    size += end - start
+            os.replace(tmp + ".new", tmp)
+            self._all_file = open(tmp, "a", encoding="utf-8", newline="\n")
+            ordered = blocks
+        self._blocks = ordered
+        playlists = {block[0]: self._playlists[block[0]] for block in ordered if block[0] in self._playlists}
+        playlists.update(self._playlists)
+        self._playlists = playlists
+
+    def _count(self, written: bool) -> None:
+        if written:
+            self.written += 1
+        else:
+            self.unchanged += 1
+
+    def _record_change(self, plist_name: str, series_name: str, old: Optional[str], new: str) -> None:
+        diff = _diff_entries(_episode_entries(old or ""), _episode_entries(new))
+        if old is not None and not any(diff.values()):
+            return  # yalnızca biçim farkı (ör. satır sonu)
+        self.changes[plist_name] = dict(diff, name=series_name, status="changed" if old is not None else "new")
+
+    @instrumented("m3u")
+    def close(self) -> None:
+        if not self._reconciled:
+            self._sort_blocks()
+        if self._all_file:
+            self._all_file.close()
+            self._all_file = None
+            tmp = self.all_path + ".tmp"
+            if _read_text(tmp) == _read_text(self.all_path):
+                os.remove(tmp)
+                self._count(False)
+            else:
+                os.replace(tmp, self.all_path)
+                self._count(True)
+        if self.master and self.series_dirs:
+            lines = ["#EXTM3U"]
+            for plist_name, series_name, series_logo, *_ in self._blocks:
+                lines.append(f'#EXTINF:-1 tvg-logo="{series_logo}", {series_name}')
+                lines.append(f'{self.base_url}{plist_name}')
+            master_path = os.path.join(self.series_dirs[0], "0.m3u")
+            self._count(_write_if_changed(master_path, "\n".join(lines) + "\n"))
+        if self._reconciled:
+            playlists = [dict(entry, file=name) for name, entry in self._playlists.items()]
+            _ensure_dir(os.path.dirname(self.state_path) or ".")
+            _write_if_changed(self.state_path, json.dumps({"playlists": playlists}, ensure_ascii=False,
+                                                          indent=1, sort_keys=True) + "\n")
+        if self.manifest_path:
+            # Zaman damgası yok: değişiklik olmayan çalıştırmalar dosyayı da değiştirmez.
+            manifest = {
+                "programs": self.changes,
+                "added": sum(len(c["added"]) for c in self.changes.values()),
+                "removed": sum(len(c["removed"]) for c in self.changes.values()),
+                "modified": sum(len(c["modified"]) for c in self.changes.values()),
+            }
+            _ensure_dir(os.path.dirname(self.manifest_path) or ".")
+            _write_if_changed(self.manifest_path,
+                              json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True) + "\n")
+        if self.catalog is not None:
+            self.catalog.close()
+
+    def abort(self) -> None:
+        """Birleşik listeyi yerine koymadan kapatır (kısmi ilerleme .tmp'de kalır)."""
+        if self._all_file:
+            self._all_file.close()
+            self._all_file = None
+        if self.catalog is not None:
+            self.catalog.abort()
+
+    def __enter__(self) -> "M3UStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def create_m3us(channel_folder_path: str,
+                data: List[Program],
+                master: bool = False,
+                base_url: str = "") -> None:
+    """
+    Her dizi için ayrı .m3u üretir, opsiyonel master (0.m3u) oluşturur.
+    NOT: Bölüm satırlarında tvg-logo olarak SERİ (program) posteri kullanılır.
+    """
+    with M3UStreamWriter([channel_folder_path], master=master, base_url=base_url) as writer:
+        for serie in (data or []):
+            writer.add(serie)
+
+def create_single_m3u(channel_folder_path: str,
+                      data: List[Program],
+                      custom_path: str = "0") -> None:
+    """
+    Tüm dizilerin tüm bölümlerini tek bir .m3u dosyasında toplar.
+    NOT: Bölüm satırlarında tvg-logo olarak SERİ (program) posteri kullanılır.
+    """
+    all_path = os.path.join(channel_folder_path, f"{custom_path}.m3u")
+    with M3UStreamWriter([], all_path=all_path) as writer:
+        for serie in (data or []):
+            writer.add(serie)
+
+def create_single_series_m3u(folder_path: str, series_data: Program) -> None:
+    """Tek bir dizinin tüm bölümlerini <dizi-adi>.m3u dosyasında toplar."""
+    if not series_data:
+        return
+    series_data = _as_program(series_data)
+    if not series_data.episodes:
+        return
+    series_name = (series_data.name or "Bilinmeyen Dizi").strip()
+    custom_path = _safe_series_filename(series_name)[:-len(".m3u")]
+    create_single_m3u(folder_path, [dataclasses.replace(series_data, name=series_name)], custom_path)
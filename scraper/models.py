@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tarama sonuçlarının kayıt tipleri (tüm kanallar için ortak)
+- Program → ad, sayfa URL'si, poster, bölümler
+- Episode → ad, görsel, sayfa URL'si, sezon/bölüm numarası (0 = bilinmiyor) ve yayın
+  adresi için yalnızca ReferenceId + PublisherId; dygvideo redirect adresi yazım
+  anında üretilir (stream_url). Üretilemeyen adresler (çözülmüş HLS, Kanal D media
+  API) `stream`'de tutulur; Kanal D'de reference_id media ID'dir.
+- to_dict()/from_dict() → kontrol noktası günlükleri ve parça dosyaları için
+  kısa JSON biçimi; eski biçimdeki (stream_url / stream_url_candidates) kayıtlar
+  da okunur.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import parse_qs
+
+STREAM_BASE = "https://dygvideo.dygdigital.com/api/redirect"
+SECRET_KEY = "NtvApiSecret2014*"   # site yapısı değişirse çalışmayabilir
+
+def render_stream_url(reference_id: str, publisher_id: int) -> str:
+    # .m3u8 eklemiyoruz; endpoint genelde redirect ediyor (--resolve-hls son adresi yazar).
+    return f"{STREAM_BASE}?PublisherId={publisher_id}&ReferenceId={reference_id}&SecretKey={SECRET_KEY}"
+
+def parse_stream_url(url: str) -> Optional[Tuple[str, int]]:
+    """render_stream_url'in tersi: (ReferenceId, PublisherId); dygvideo redirect adresi değilse None."""
+    if not url.startswith(STREAM_BASE + "?"):
+        return None
+    query = parse_qs(url[len(STREAM_BASE) + 1:])
+    try:
+        return query["ReferenceId"][0], int(query["PublisherId"][0])
+    except (KeyError, IndexError, ValueError):
+        return None
+
+@dataclass(slots=True)
+class Episode:
+    name: str
+    img: str = ""
+    url: str = ""
+    season: int = 0
+    number: int = 0
+    reference_id: str = ""
+    publisher: int = 0             # seçilen PublisherId
+    stream: Optional[str] = None   # ReferenceId'den üretilemeyen yayın adresi
+
+    @property
+    def stream_url(self) -> Optional[str]:
+        if self.stream:
+            return self.stream
+        if self.reference_id:
+            return render_stream_url(self.reference_id, self.publisher)
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"name": self.name}
+        if self.img:
+            data["img"] = self.img
+        if self.url:
+            data["url"] = self.url
+        if self.season:
+            data["season"] = self.season
+        if self.number:
+            data["no"] = self.number
+        if self.reference_id:
+            data["ref"] = self.reference_id
+        if self.stream:
+            data["stream"] = self.stream
+        elif self.reference_id:
+            data["pub"] = self.publisher
+        return data
+
+    @classmethod
+    def from_stream_url(cls, name: str, url: str, img: str = "") -> "Episode":
+        """M3U satırından: üretilebilen redirect adresi yalnızca ReferenceId + PublisherId olarak saklanır."""
+        parsed = parse_stream_url(url)
+        if parsed and render_stream_url(*parsed) == url:
+            return cls(name=name, img=img, reference_id=parsed[0], publisher=parsed[1])
+        return cls(name=name, img=img, stream=url)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Episode":
+        stream = data.get("stream") or data.get("stream_url")
+        candidates = data.get("stream_url_candidates")
+        if not stream and not data.get("ref") and isinstance(candidates, (list, tuple)) and candidates:
+            stream = candidates[0]
+        return cls(name=data.get("name") or "", img=data.get("img") or "", url=data.get("url") or "",
+                   season=int(data.get("season") or 0), number=int(data.get("no") or 0),
+                   reference_id=data.get("ref") or data.get("media_id") or "", publisher=int(data.get("pub") or 0),
+                   stream=stream)
+
+@dataclass(slots=True)
+class Program:
+    name: str = ""
+    url: str = ""
+    img: str = ""
+    episodes: List[Episode] = field(default_factory=list)
+    skipped: bool = False   # planlayıcı atladı; yazıcı önceki listeyi kullanır
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"name": self.name, "url": self.url, "img": self.img,
+                                "episodes": [ep.to_dict() for ep in self.episodes]}
+        if self.skipped:
+            data["skipped"] = True
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Program":
+        return cls(name=data.get("name") or "", url=data.get("url") or "", img=data.get("img") or "",
+                   episodes=[Episode.from_dict(ep) for ep in data.get("episodes") or []],
+                   skipped=bool(data.get("skipped")))
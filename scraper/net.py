@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+
+"""
+Ortak ağ katmanı (tüm kanallar tek süreçte aynı havuzu paylaşır)
+- SESSION        → tek requests.Session, tek bağlantı havuzu (TLS bağlantıları yeniden kullanılır)
+- RATE_LIMITER   → host başına uyarlanır istek hızı (AIMD; 429/5xx, gecikme ve Retry-After'a göre)
+- HTTP_CACHE     → ETag / Last-Modified ile koşullu istekler, gövdeler ve ayıklanmış sonuçlar diskte
+- her yanıt ve yeniden deneme TELEMETRY'ye de yazılır (istek sayısı, bayt, gecikme)
+- make_soup / get_soup_from_get / get_soup_from_post → lxml varsa onunla ayrıştırma
+- get_extracted_from_get / get_extracted_from_post → 304'te ayrıştırmadan önceki sonucu döndürür
+"""
+
+import os
+import time
+import json
+import zlib
+import hashlib
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Tuple, Dict, Any, Optional, Callable
+from urllib.parse import urlparse, urlencode
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter, Retry
+
+from .m3u import _ensure_dir, _atomic_write
+from .telemetry import TELEMETRY
+
+# Opsiyonel: lxml kuruluysa BeautifulSoup onu kullanır (html.parser'dan kat kat hızlı)
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+REQUEST_TIMEOUT = 15
+BACKOFF_FACTOR = 0.6
+MAX_RETRIES = 5
+
+# Eşzamanlılık: program ve bölüm sayfaları işçi havuzlarında çekilir.
+# Eski sabit REQUEST_PAUSE beklemesinin yerini host başına uyarlanır hız alır
+# (--workers 1 --rate 5 --max-rate 5 eski sıralı davranışa denktir).
+MAX_WORKERS = 8        # eşzamanlı işçi sayısı
+HOST_RATE_LIMIT = 8.0  # host başına başlangıç hızı (istek/sn); yanıtlara göre uyarlanır
+HOST_RATE_LIMIT_MAX = 32.0  # uyarlanır hızın üst sınırı
+HOST_RATE_MIN = 0.5         # 429/5xx ardından inilebilecek en düşük hız
+RETRY_AFTER_MAX = 120.0     # Retry-After en fazla bu kadar saniye dikkate alınır
+RATE_LOG_INTERVAL = 30.0    # host başına hız değişimi en sık bu aralıkla loglanır
+POOL_SIZE = 32         # HTTPAdapter bağlantı havuzu boyutu
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0 Safari/537.36"
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)-8s | %(message)s",
+    datefmt="%H:%M:%S",
+)
+log = logging.getLogger("scraper")
+
+class _ObservedRetry(Retry):
+    """urllib3'ün kendi içinde yeniden denediği 429/5xx yanıtlarını da hız denetleyicisine bildirir."""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        TELEMETRY.retry()
+        if response is not None and _pool is not None and response.status in self.status_forcelist:
+            RATE_LIMITER.observe(_pool.host, response.status, None, response.headers.get("Retry-After"))
+        return super().increment(method=method, url=url, response=response, error=error,
+                                 _pool=_pool, _stacktrace=_stacktrace)
+
+SESSION = requests.Session()
+retries = _ObservedRetry(
+    total=MAX_RETRIES,
+    backoff_factor=BACKOFF_FACTOR,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET", "HEAD", "POST"]),
+    raise_on_status=False,
+)
+SESSION.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=POOL_SIZE))
+SESSION.mount("http://", HTTPAdapter(max_retries=retries, pool_maxsize=POOL_SIZE))
+SESSION.headers.update({"User-Agent": USER_AGENT})
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After: saniye ya da HTTP tarihi → bekleme süresi (sn)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class _HostState:
+    __slots__ = ("rate", "next_slot", "latency", "baseline", "last_cut", "last_log", "throttled")
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.next_slot = 0.0
+        self.latency = 0.0    # hızlı EWMA
+        self.baseline = 0.0   # yavaş EWMA (sunucunun olağan gecikmesi)
+        self.last_cut = 0.0
+        self.last_log = 0.0
+        self.throttled = 0
+
+class HostRateLimiter:
+    """
+    Host başına uyarlanır istek hızı (AIMD, thread-safe).
+    - `wait()` host için bir sonraki boş zaman dilimini ayırır ve o ana kadar bekler;
+      işçi sayısından bağımsız olarak saniyede en fazla o anki `rate` kadar istek gider.
+    - `observe()` her yanıtla çağrılır (SESSION yanıt kancası ve urllib3 yeniden denemeleri):
+      hızlı ve başarılı yanıtlar hızı toplamsal olarak artırır (saniyede ~1 istek/sn,
+      en fazla `max_rate`); 429/5xx hızı yarıya, artan gecikme %15 düşürür (saniyede
+      en fazla bir kez). Retry-After gelirse host o süre boyunca hiç istek almaz.
+    - `rate` başlangıç hızıdır; `max_rate <= rate` ise hız sabit kalır, `rate <= 0` sınırsız.
+    """
+
+    def __init__(self, rate: float, max_rate: float = HOST_RATE_LIMIT_MAX) -> None:
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+        self.rate = rate
+        self.max_rate = max_rate
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.rate)
+        return state
+
+    def wait(self, url: str) -> None:
+        if self.rate <= 0:
+            return
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            slot = max(now, state.next_slot)
+            state.next_slot = slot + 1.0 / state.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def observe(self, host: str, status: int, latency: Optional[float],
+                retry_after: Optional[str] = None) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            old_rate = state.rate
+            if status == 429 or status >= 500:
+                state.throttled += 1
+                pause = _parse_retry_after(retry_after)
+                if pause:
+                    state.next_slot = max(state.next_slot, now + min(pause, RETRY_AFTER_MAX))
+                if now - state.last_cut >= 1.0:
+                    state.rate = max(HOST_RATE_MIN, state.rate * 0.5)
+                    state.last_cut = now
+            elif latency is not None:
+                if state.baseline == 0.0:
+                    state.latency = state.baseline = latency
+                state.latency += 0.3 * (latency - state.latency)
+                state.baseline += 0.02 * (latency - state.baseline)
+                if state.latency > 2.0 * state.baseline and state.latency > 0.5:
+                    if now - state.last_cut >= 1.0:
+                        state.rate = max(HOST_RATE_MIN, state.rate * 0.85)
+                        state.last_cut = now
+                elif status < 400 and state.latency <= 1.25 * state.baseline:
+                    state.rate = min(max(self.rate, self.max_rate), state.rate + 1.0 / state.rate)
+            if state.rate != old_rate and now - state.last_log >= RATE_LOG_INTERVAL:
+                state.last_log = now
+                log.info("Hız %s: %.1f istek/sn (gecikme %.0f ms)", host, state.rate, state.latency * 1000)
+
+    def report(self) -> None:
+        with self._lock:
+            for host, state in sorted(self._hosts.items()):
+                log.info("Hız %s: son %.1f istek/sn, %d kez 429/5xx", host, state.rate, state.throttled)
+
+RATE_LIMITER = HostRateLimiter(HOST_RATE_LIMIT)
+
+def _observe_response(r: requests.Response, *args: Any, **kwargs: Any) -> None:
+    latency = r.elapsed.total_seconds()
+    RATE_LIMITER.observe(urlparse(r.url).hostname or "", r.status_code, latency, r.headers.get("Retry-After"))
+    # stream=True yanıtlarının gövdesi okunmaz; boyut başlıktan alınır
+    size = int(r.headers.get("Content-Length") or 0) if kwargs.get("stream") else len(r.content)
+    TELEMETRY.request(r.status_code, latency, size)
+
+SESSION.hooks["response"].append(_observe_response)
+
+HTTP_CACHE_NAME = "http"
+HTTP_CACHE_TTL_DAYS = 30  # bu süre boyunca hiç kullanılmayan kayıtlar diskten silinir
+
+class HttpCache:
+    """
+    SESSION etrafında koşullu HTTP katmanı (thread-safe).
+    `cache=True` ile yapılan isteklerin gövdesi ve doğrulayıcıları (ETag / Last-Modified)
+    diskte saklanır; sonraki çalıştırmada istek If-None-Match / If-Modified-Since ile
+    gider ve 304 gelirse gövde diskten okunur. Doğrulayıcı göndermeyen yanıtlar saklanmaz.
+    `extract` verilirse ayıklayıcının (JSON'a yazılabilir) çıktısı doğrulayıcıların yanına
+    `name` adıyla yazılır; 304'te gövde ne okunur ne ayrıştırılır, bu çıktı döner.
+    Kullanılan kayıtların zaman damgası yenilenir; `prune` ttl boyunca dokunulmayanları siler.
+    """
+
+    def __init__(self, ttl_days: float = HTTP_CACHE_TTL_DAYS) -> None:
+        self._lock = threading.Lock()
+        self._dir: Optional[str] = None
+        self.ttl = ttl_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.reused = 0
+        self.pruned = 0
+
+    def load(self, path: str) -> None:
+        self._dir = path
+        _ensure_dir(path)
+
+    def _paths(self, method: str, url: str, data: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        raw = f"{method} {url}"
+        if data:
+            raw += "?" + urlencode(sorted(data.items()))
+        key = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        base = os.path.join(self._dir, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def _read_meta(self, meta_path: str) -> Dict[str, Any]:
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            return meta if isinstance(meta, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _read_body(self, body_path: str) -> Optional[bytes]:
+        try:
+            with open(body_path, "rb") as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def _store(self, meta_path: str, body_path: str, r: requests.Response,
+               extracted: Optional[Dict[str, Any]] = None) -> None:
+        meta: Dict[str, Any] = {"url": r.url, "etag": r.headers.get("ETag"),
+                                "last_modified": r.headers.get("Last-Modified"), "size": len(r.content)}
+        if extracted:
+            meta["extracted"] = extracted
+        _ensure_dir(os.path.dirname(meta_path))
+        tmp = body_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(zlib.compress(r.content))
+        os.replace(tmp, body_path)
+        _atomic_write(meta_path, json.dumps(meta, ensure_ascii=False))
+
+    @staticmethod
+    def _touch(*paths: str) -> None:
+        """Kaydın son kullanım zamanını yeniler (prune buna bakar)."""
+        for path in paths:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    def fetch(self, method: str, url: str, data: Optional[Dict[str, Any]] = None,
+              cache: bool = False, headers: Optional[Dict[str, str]] = None,
+              timeout: float = REQUEST_TIMEOUT,
+              extract: Optional[Callable[[bytes], Any]] = None, name: str = "") -> Any:
+        """
+        Yanıt gövdesini döndürür; `extract` verilmişse gövde yerine extract(gövde) döner.
+        Ayıklanmış sonuç yalnızca `name` eşleşirse yeniden kullanılır (ayıklayıcının
+        çıktı biçimi değişince adı değiştirilir, eski kayıtlar gövdeden yeniden ayıklanır).
+        """
+        if not (cache and self._dir):
+            r = SESSION.request(method, url, data=data, headers=headers, timeout=timeout)
+            r.raise_for_status()
+            return extract(r.content) if extract else r.content
+
+        meta_path, body_path = self._paths(method, url, data)
+        meta = self._read_meta(meta_path)
+        extracted = meta.get("extracted") or {}
+        reusable = bool(extract and name and name in extracted)
+        # Ayıklanmış sonuç varsa gövdeye yalnızca 304'te de gerekmez; yoksa doğrulayıcılar
+        # ancak gövde okunabiliyorsa gönderilir.
+        body = None if reusable or not meta else self._read_body(body_path)
+        request_headers: Dict[str, str] = dict(headers or {})
+        if reusable or body is not None:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        r = SESSION.request(method, url, data=data, headers=request_headers, timeout=timeout)
+        if r.status_code == 304 and (reusable or body is not None):
+            self._touch(meta_path, body_path)
+            with self._lock:
+                self.hits += 1
+                self.bytes_saved += int(meta.get("size") or 0) if reusable else len(body)
+                if reusable:
+                    self.reused += 1
+            if reusable:
+                return extracted[name]
+            if not extract:
+                return body
+            # Ayıklayıcı yeni/değişmiş: gövdeden bir kez ayıkla, sonucu kayda ekle
+            value = extract(body)
+            if name:
+                meta["extracted"] = {**extracted, name: value}
+                meta.setdefault("size", len(body))
+                _atomic_write(meta_path, json.dumps(meta, ensure_ascii=False))
+            return value
+        r.raise_for_status()
+        with self._lock:
+            self.misses += 1
+        value = extract(r.content) if extract else r.content
+        if r.headers.get("ETag") or r.headers.get("Last-Modified"):
+            self._store(meta_path, body_path, r, {name: value} if extract and name else None)
+        return value
+
+    def prune(self) -> None:
+        """ttl boyunca hiç kullanılmayan (isabet ya da yazma almayan) kayıtları siler."""
+        if not (self._dir and self.ttl > 0):
+            return
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for root, _dirs, files in os.walk(self._dir):
+            for fname in files:
+                path = os.path.join(root, fname)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        if fname.endswith(".json"):
+                            removed += 1
+                except OSError:
+                    pass
+        self.pruned = removed
+        if removed:
+            log.info("HTTP önbelleği: %d gün kullanılmayan %d kayıt silindi", round(self.ttl / 86400), removed)
+
+    def report(self) -> None:
+        if self._dir:
+            log.info("HTTP önbelleği: %d isabet (304, %d ayrıştırmasız), %d ıska, %.1f MB tasarruf",
+                     self.hits, self.reused, self.misses, self.bytes_saved / 1e6)
+
+HTTP_CACHE = HttpCache()
+
+def safe_soup_get(attr_getter, default=None):
+    try:
+        return attr_getter()
+    except Exception:
+        return default
+
+def has_class(*names: str) -> Callable[[Any], bool]:
+    """
+    SoupStrainer için class eşleştiricisi. Ayrıştırma anında class değeri henüz
+    listeye bölünmemiş ham metin olabildiğinden ("item col-12") kendimiz böleriz.
+    """
+    wanted = set(names)
+
+    def match(value: Any) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return not wanted.isdisjoint(classes)
+
+    return match
+
+def make_soup(content: bytes, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    with TELEMETRY.parsing():
+        return BeautifulSoup(content, HTML_PARSER, parse_only=parse_only)
+
+def get_soup_from_post(url: str, data: Dict[str, Any], cache: bool = False,
+                       parse_only: Optional[SoupStrainer] = None,
+                       **request_options: Any) -> Optional[BeautifulSoup]:
+    RATE_LIMITER.wait(url)
+    try:
+        content = HTTP_CACHE.fetch("POST", url, data=data, cache=cache, **request_options)
+        return make_soup(content, parse_only)
+    except Exception as e:
+        log.warning("POST %s hatası: %s", url, e)
+        return None
+
+def get_content_from_get(url: str, cache: bool = False, **request_options: Any) -> Optional[bytes]:
+    RATE_LIMITER.wait(url)
+    try:
+        return HTTP_CACHE.fetch("GET", url, cache=cache, **request_options)
+    except Exception as e:
+        log.warning("GET %s hatası: %s", url, e)
+        return None
+
+def get_soup_from_get(url: str, cache: bool = False,
+                      parse_only: Optional[SoupStrainer] = None,
+                      **request_options: Any) -> Optional[BeautifulSoup]:
+    content = get_content_from_get(url, cache=cache, **request_options)
+    if content is None:
+        return None
+    try:
+        return make_soup(content, parse_only)
+    except Exception as e:
+        log.warning("GET %s ayrıştırma hatası: %s", url, e)
+        return None
+
+def _soup_extractor(extract: Callable[[BeautifulSoup], Any],
+                    parse_only: Optional[SoupStrainer]) -> Callable[[bytes], Any]:
+    return lambda content: extract(make_soup(content, parse_only))
+
+def get_extracted_from_post(url: str, data: Dict[str, Any], extract: Callable[[BeautifulSoup], Any],
+                            name: str, parse_only: Optional[SoupStrainer] = None,
+                            **request_options: Any) -> Any:
+    """
+    Sayfayı ayrıştırıp extract(soup) döndürür (önbellekli); çıktı JSON'a yazılabilir
+    olmalıdır. 304'te önceki çıktı ayrıştırmadan döner. Hata olursa None.
+    """
+    RATE_LIMITER.wait(url)
+    try:
+        return HTTP_CACHE.fetch("POST", url, data=data, cache=True, name=name,
+                                extract=_soup_extractor(extract, parse_only), **request_options)
+    except Exception as e:
+        log.warning("POST %s hatası: %s", url, e)
+        return None
+
+def get_extracted_from_get(url: str, extract: Callable[[BeautifulSoup], Any], name: str,
+                           parse_only: Optional[SoupStrainer] = None,
+                           **request_options: Any) -> Any:
+    """get_extracted_from_post'un GET karşılığı."""
+    RATE_LIMITER.wait(url)
+    try:
+        return HTTP_CACHE.fetch("GET", url, cache=True, name=name,
+                                extract=_soup_extractor(extract, parse_only), **request_options)
+    except Exception as e:
+        log.warning("GET %s hatası: %s", url, e)
+        return None
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Öncelikli tarama planı
+- SCHEDULE → program başına geçmiş (schedule.json): son taramadaki bölüm sayısı ve
+  parmak izi, en yeni sezon, kaç taramanın kaçında değiştiği, son değişiklik zamanı.
+- order()  → (--schedule) programlar önceliğe göre işlenir: yeni görülenler, son
+  taramada bölüm sayısı artanlar, sık değişenler ve yakın zamanda değişenler önce;
+  A–Z arşiv en sona. completed() sonuçları bitiş sırasıyla verir; dizi listeleri
+  hemen yazılır, birleşik listenin A–Z sırası yazıcıda korunur.
+- due()    → (--schedule) uzun süredir değişmeyen programlar her çalıştırmada değil,
+  durgunluk süresiyle uzayan aralıklarla taranır. Aradaki çalıştırmalarda son
+  sağlam listeleri korunur (M3UStreamWriter, "skipped" kaydı). Program sayfasında
+  yeni sezon görünürse aralık beklenmez.
+"""
+
+import time
+import queue
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Sequence, Callable, Iterator, Tuple
+
+from .cache import load_state, save_state, ttl_spread
+from .models import Program
+from .net import log
+
+SCHEDULE_NAME = "schedule.json"
+SCHEDULE_ACTIVE_DAYS = 14         # son değişikliği bu kadar yeni olan program her çalıştırmada taranır
+SCHEDULE_FREQUENT_RATE = 0.25     # taramaların en az bu oranında değişen program her çalıştırmada taranır
+SCHEDULE_BACKOFF = 0.1            # durgun programın tarama aralığı = durgunluk süresi × bu oran
+SCHEDULE_MAX_INTERVAL_DAYS = 7    # ... en fazla bu kadar gün
+
+def skipped(url: str, name: str = "") -> Program:
+    """Planlayıcının atladığı program için çıktıya giden kayıt (son sağlam liste korunur)."""
+    return Program(name=name, url=url, skipped=True)
+
+def _fingerprint(result: Program) -> str:
+    keys = "\n".join(ep.url or ep.name for ep in result.episodes)
+    return hashlib.sha1(keys.encode("utf-8")).hexdigest()[:16]
+
+class Scheduler:
+    """
+    Program URL'si → geçmiş (thread-safe). Kayıt:
+    {"fp", "episodes", "added", "season", "runs", "changes", "changed", "crawled"} (zamanlar
+    epoch sn; "added" = son taramada önceki taramaya göre artan bölüm sayısı)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._seasons: Dict[str, str] = {}  # bu çalıştırmada görülen en yeni sezon
+        self.enabled = False
+        self.skipped = 0
+        self.new_seasons = 0
+
+    def load(self, path: str) -> None:
+        self._path = path
+        self._entries.update(load_state(path).get("programs") or {})
+
+    def save(self) -> None:
+        if not self._path:
+            return
+        with self._lock:
+            save_state(self._path, {"programs": self._entries})
+            if self.enabled:
+                log.info("Tarama planı: %d durgun program atlandı, %d programda yeni sezon", self.skipped,
+                         self.new_seasons)
+
+    def _interval(self, url: str, entry: Dict[str, Any], now: float) -> float:
+        idle_days = (now - float(entry.get("changed", 0))) / 86400
+        rate = entry.get("changes", 0) / max(1, entry.get("runs", 0))
+        if entry.get("added") or idle_days <= SCHEDULE_ACTIVE_DAYS or rate >= SCHEDULE_FREQUENT_RATE:
+            return 0.0
+        # Aynı gün durgunlaşan programlar aynı gün toplu taranmasın diye URL'ye göre dağıtılır.
+        return min(SCHEDULE_MAX_INTERVAL_DAYS, idle_days * SCHEDULE_BACKOFF) * 86400 * ttl_spread(url) / 2
+
+    def _priority(self, url: str, now: float) -> float:
+        entry = self._entries.get(url)
+        if entry is None:
+            return float("inf")  # hiç taranmamış (yeni) program
+        idle_days = (now - float(entry.get("changed", 0))) / 86400
+        rate = entry.get("changes", 0) / max(1, entry.get("runs", 0))
+        return (1.0 if entry.get("added") else 0.0) + rate + 1.0 / (1.0 + idle_days)
+
+    def order(self, indices: Sequence[int], urls: Sequence[str]) -> List[int]:
+        """İndeksleri önceliğe göre sıralar (eşitlikte özgün sıra); plan kapalıysa A–Z sırası."""
+        if not self.enabled:
+            return list(indices)
+        now = time.time()
+        with self._lock:
+            priority = {i: self._priority(urls[i], now) for i in indices}
+        return sorted(indices, key=lambda i: -priority[i])
+
+    def due(self, url: str, newest_season: Optional[str] = None) -> bool:
+        """
+        Program bu çalıştırmada taranmalı mı? Plan kapalıysa, program yeniyse, yeni
+        sezon çıktıysa ya da aralığı dolduysa True. `newest_season`: kanalın belirlediği
+        en yeni sezon (discovery'de _newest_season; sayfadaki sıra değişse de aynı kalır).
+        """
+        newest = str(newest_season) if newest_season else ""
+        now = time.time()
+        with self._lock:
+            if newest:
+                self._seasons[url] = newest
+            entry = self._entries.get(url)
+            if not self.enabled or entry is None or not entry.get("episodes"):
+                return True
+            if newest and entry.get("season") and newest != entry["season"]:
+                self.new_seasons += 1
+                return True
+            if now - float(entry.get("crawled", 0)) >= self._interval(url, entry, now):
+                return True
+            self.skipped += 1
+            return False
+
+    def observe(self, url: str, result: Optional[Program]) -> None:
+        """Taranan programın sonucunu geçmişe işler (başarısız tarama yok sayılır)."""
+        if not result or result.skipped:
+            return
+        now = time.time()
+        fingerprint = _fingerprint(result)
+        with self._lock:
+            entry = self._entries.setdefault(url, {"runs": 0, "changes": 0})
+            entry["runs"] = entry.get("runs", 0) + 1
+            if entry.get("fp") != fingerprint:
+                entry["changes"] = entry.get("changes", 0) + 1
+                entry["changed"] = int(now)
+            entry["fp"] = fingerprint
+            if "episodes" in entry:
+                entry["added"] = max(0, len(result.episodes) - int(entry["episodes"]))
+            entry["episodes"] = len(result.episodes)
+            entry["crawled"] = int(now)
+            if url in self._seasons:
+                entry["season"] = self._seasons[url]
+
+SCHEDULE = Scheduler()
+
+def completed(pool: ThreadPoolExecutor, fn: Callable[[int], Any],
+              order: Sequence[int]) -> Iterator[Tuple[int, Any]]:
+    """
+    fn(i)'yi `order` sırasıyla havuza gönderir, (i, sonuç) çiftlerini bitiş sırasıyla
+    verir. Tamamlanan görevlere başka referans tutulmaz; tüketilen sonuç bellekte
+    birikmez. Görevdeki hata tüketildiği anda yükseltilir.
+    """
+    done: "queue.Queue[Future]" = queue.Queue()
+    index_of: Dict[Future, int] = {}
+    for i in order:
+        future = pool.submit(fn, i)
+        index_of[future] = i
+        future.add_done_callback(done.put)
+    for _ in range(len(index_of)):
+        future = done.get()
+        yield index_of.pop(future), future.result()
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+"""
+Yayın adresi doğrulama
+- STREAM_VALIDATOR → aday yayın URL'lerini (PublisherId başına bir redirect adresi)
+  HEAD / tek baytlık ranged GET ile yoklar, yönlendirmeyi izler ve çalışanı seçer.
+- Program başına kazanan PublisherId hatırlanır (streams.json); sonraki bölümler
+  önce yalnızca onu dener, kaybeden adaylar yeniden yoklanmaz.
+- Aday başına sonuç (ReferenceId + PublisherId → durum kodu) da streams.json'da
+  STREAM_VERDICT_TTL_DAYS boyunca tutulur; günlük çalıştırma yalnızca yeni ya da
+  süresi dolmuş adayları yoklar. Yalnızca kesin sonuçlar (< 400 ya da 404/410 gibi
+  4xx) saklanır; ağ hatası, 429 ve 5xx geçicidir, saklanmaz.
+- Ölü adaylar dead_streams.json raporunda toplanır.
+- HLS_RESOLVER → redirect adresini bir kez izleyip son HLS master URL'sini yazar;
+  çözülen adresler süreli olarak hls.json'da tutulur.
+"""
+
+import os
+import time
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Any, Optional, Sequence
+from urllib.parse import urlsplit, parse_qsl
+
+import requests
+
+from .cache import load_state, save_state, ttl_spread
+from .m3u import _ensure_dir, _atomic_write
+from .models import parse_stream_url
+from .net import SESSION, RATE_LIMITER, log
+from .telemetry import instrumented
+
+STREAM_PROBE_WORKERS = 8   # aynı anda en fazla yoklama
+STREAM_PROBE_TIMEOUT = 10
+STREAM_WINNERS_NAME = "streams.json"
+STREAM_VERDICT_TTL_DAYS = 7  # aday sonucu bu kadar (anahtara göre 1–2 katı) yeniden yoklanmaz
+DEAD_STREAMS_NAME = "dead_streams.json"
+HLS_CACHE_NAME = "hls.json"
+HLS_TTL_HOURS = 72          # süre bilgisi taşımayan çözülmüş adresler bu kadar kullanılır
+HLS_MIN_LIFETIME = 86400    # bundan erken dolacak (jetonlu) adres listeye yazılmaz: günlük güncellemeye yetmez
+
+# Jetonlu CDN adreslerinde son kullanma zamanını (epoch sn) taşıyan sorgu parametreleri
+_EXPIRY_PARAMS = ("expires", "expire", "exp", "e", "validto", "token_expires")
+
+# HEAD'i desteklemeyen sunucular bu kodlarla döner; ranged GET ile yeniden denenir.
+_HEAD_UNSUPPORTED = (403, 405, 501)
+
+# Adayın ölü olduğunu göstermeyen (geçici) 4xx kodları; 5xx de geçici sayılır.
+_TRANSIENT_STATUSES = (408, 425, 429)
+
+def _is_transient(status: int) -> bool:
+    return status >= 500 or status in _TRANSIENT_STATUSES
+
+class StreamValidator:
+    """
+    Aday URL'leri eşzamanlı yoklar (thread-safe). Sonuç kuralı:
+    - yanıtı < 400 olan ilk aday (kazanan önce) seçilir;
+    - tüm adaylar kesin hata (404/410 gibi 4xx) verirse bölüm için URL yoktur (None);
+    - aksi halde doğrulanamamış (ağ hatası, 429, 5xx) ilk aday kullanılır, geçici
+      kesintilerde listeler boşalmasın diye.
+    """
+
+    def __init__(self, workers: int = STREAM_PROBE_WORKERS, ttl_days: float = STREAM_VERDICT_TTL_DAYS) -> None:
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._path: Optional[str] = None
+        self._winners: Dict[str, str] = {}
+        self._verdicts: Dict[str, Tuple[int, float]] = {}  # "PublisherId:ReferenceId" → (durum, zaman)
+        self.workers = workers
+        self.ttl = ttl_days * 86400
+        self.full_refresh = False
+        self.enabled = False
+        self.hits = 0
+        self.probed = 0
+        self.alive = 0
+        self.unverified = 0
+        self.dead: List[Dict[str, Any]] = []
+
+    def load(self, path: str) -> None:
+        self._path = path
+        state = load_state(path)
+        self._winners.update(state.get("winners") or {})
+        try:
+            self._verdicts.update((key, (int(status), float(ts)))
+                                  for key, (status, ts) in (state.get("verdicts") or {}).items())
+        except (ValueError, TypeError, AttributeError):
+            pass
+
+    def save(self) -> None:
+        if not self._path:
+            return
+        with self._lock:
+            verdicts = {key: [status, int(ts)] for key, (status, ts) in self._verdicts.items()
+                        if self._is_fresh(key, ts)}
+            save_state(self._path, {"winners": self._winners, "verdicts": verdicts})
+
+    @staticmethod
+    def _verdict_key(url: str) -> str:
+        parsed = parse_stream_url(url)
+        return f"{parsed[1]}:{parsed[0]}" if parsed else url
+
+    def _is_fresh(self, key: str, ts: float) -> bool:
+        return time.time() - ts < self.ttl * ttl_spread(key)
+
+    def status(self, candidate: Tuple[str, str]) -> Optional[int]:
+        """
+        Adayın kesin durum kodu: taze önbellek kaydı varsa o, yoksa yoklama sonucu.
+        Geçici yanıtlar (429, 5xx) ağ hatası gibi None döner ve saklanmaz.
+        """
+        url = candidate[1]
+        key = self._verdict_key(url)
+        with self._lock:
+            entry = None if self.full_refresh else self._verdicts.get(key)
+            if entry and not _is_transient(entry[0]) and self._is_fresh(key, entry[1]):
+                self.hits += 1
+                return entry[0]
+            self.probed += 1
+        status = self.probe(url)
+        if status is not None and _is_transient(status):
+            status = None
+        if status is not None:
+            with self._lock:
+                self._verdicts[key] = (status, time.time())
+        return status
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="yoklama")
+            return self._pool
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown()
+
+    @instrumented("streams.probe")
+    def probe(self, url: str) -> Optional[int]:
+        """Yönlendirmeleri izleyerek son yanıtın durum kodunu döndürür; ağ hatasında None."""
+        status, final_url = follow(url)
+        if status is not None and status < 400:
+            HLS_RESOLVER.put(url, final_url)
+        return status
+
+    def choose(self, key: str, candidates: Sequence[Tuple[str, str]]) -> Optional[str]:
+        """
+        candidates: (etiket, url) çiftleri (etiket = PublisherId). `key` ile aynı
+        gruptaki (program) önceki kazanan önce tek başına denenir; başarısız olursa
+        kalan adaylar eşzamanlı yoklanır.
+        """
+        if not candidates:
+            return None
+        with self._lock:
+            winner = self._winners.get(key)
+        ordered = sorted(candidates, key=lambda c: c[0] != winner)
+
+        statuses: List[Optional[int]] = []
+        if winner is not None and ordered[0][0] == winner:
+            statuses.append(self.status(ordered[0]))
+            if statuses[0] is not None and statuses[0] < 400:
+                return self._accept(key, ordered[0])
+        statuses += list(self._executor().map(self.status, ordered[len(statuses):]))
+
+        with self._lock:
+            self.dead.extend(
+                {"key": key, "publisher": label, "url": url, "status": status}
+                for (label, url), status in zip(ordered, statuses) if status is not None and status >= 400
+            )
+        for (label, url), status in zip(ordered, statuses):
+            if status is not None and status < 400:
+                return self._accept(key, (label, url))
+        unverified = [url for (_, url), status in zip(ordered, statuses) if status is None]
+        if not unverified:
+            return None
+        with self._lock:
+            self.unverified += 1
+        return unverified[0]
+
+    def _accept(self, key: str, candidate: Tuple[str, str]) -> str:
+        with self._lock:
+            self._winners[key] = candidate[0]
+            self.alive += 1
+        return candidate[1]
+
+    def report(self, path: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            dead = sorted(self.dead, key=lambda d: (d["key"], d["url"]))
+            log.info("Yayın doğrulama: %d çalışan, %d ölü aday, %d doğrulanamayan (%d yoklandı, %d önbellekten)",
+                     self.alive, len(dead), self.unverified, self.probed, self.hits)
+        _ensure_dir(os.path.dirname(path))
+        _atomic_write(path, json.dumps({"dead": dead}, ensure_ascii=False, indent=1))
+
+def follow(url: str) -> Tuple[Optional[int], str]:
+    """
+    Yönlendirmeleri HEAD ile izler (desteklenmiyorsa tek baytlık ranged GET).
+    (son durum kodu, son URL) döndürür; ağ hatasında (None, url).
+    """
+    RATE_LIMITER.wait(url)
+    try:
+        r = SESSION.head(url, allow_redirects=True, timeout=STREAM_PROBE_TIMEOUT)
+        if r.status_code in _HEAD_UNSUPPORTED:
+            RATE_LIMITER.wait(r.url)
+            r = SESSION.get(r.url, headers={"Range": "bytes=0-0"}, stream=True,
+                            allow_redirects=True, timeout=STREAM_PROBE_TIMEOUT)
+            r.close()
+        return r.status_code, r.url
+    except requests.exceptions.RequestException as e:
+        log.debug("Yoklama hatası %s: %s", url, e)
+        return None, url
+
+STREAM_VALIDATOR = StreamValidator()
+
+class HlsResolver:
+    """
+    redirect URL'si → son HLS master URL'si (thread-safe).
+    - Kayıt (son URL, son kullanma) olarak hls.json'da tutulur. Son kullanma, adres
+      jetonlu ise sorgudaki süre parametresinden, değilse çözüm anı + TTL'den gelir.
+    - Süresi dolmuş kayıt yeniden çözülür; çözüm başarısızsa ya da jeton
+      HLS_MIN_LIFETIME'dan erken doluyorsa redirect URL'si aynen kullanılır.
+    """
+
+    def __init__(self, ttl_hours: float = HLS_TTL_HOURS) -> None:
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self.ttl = ttl_hours * 3600
+        self.enabled = False
+        self.hits = 0
+        self.resolved = 0
+        self.fallbacks = 0
+
+    def load(self, path: str) -> None:
+        self._path = path
+        now = time.time()
+        try:
+            self._entries.update((url, (final, float(expires)))
+                                 for url, (final, expires) in (load_state(path).get("urls") or {}).items()
+                                 if float(expires) > now)
+        except (ValueError, TypeError, AttributeError):
+            pass
+
+    def save(self) -> None:
+        if not self._path or not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            save_state(self._path, {"urls": {url: [final, int(expires)] for url, (final, expires)
+                                             in self._entries.items() if expires > now}})
+            log.info("HLS çözümleme: %d önbellekten, %d çözüldü, %d redirect olarak kaldı",
+                     self.hits, self.resolved, self.fallbacks)
+
+    def _expires(self, final_url: str, now: float) -> float:
+        for key, value in parse_qsl(urlsplit(final_url).query):
+            if key.lower() in _EXPIRY_PARAMS and value.isdigit() and int(value) > 1e9:
+                return float(value)
+        return now + self.ttl
+
+    def put(self, url: str, final_url: str) -> None:
+        """Başka bir yoklamada (doğrulama) zaten izlenmiş yönlendirmeyi kaydeder."""
+        if not self.enabled or final_url == url:
+            return
+        now = time.time()
+        with self._lock:
+            self._entries[url] = (final_url, self._expires(final_url, now))
+
+    @instrumented("streams.hls")
+    def resolve(self, url: str) -> str:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry and entry[1] > now + HLS_MIN_LIFETIME:
+            with self._lock:
+                self.hits += 1
+            return entry[0]
+
+        status, final_url = follow(url)
+        expires = self._expires(final_url, now)
+        if status is None or status >= 400 or final_url == url or expires <= now + HLS_MIN_LIFETIME:
+            with self._lock:
+                self.fallbacks += 1
+            return url
+        with self._lock:
+            self._entries[url] = (final_url, expires)
+            self.resolved += 1
+        return final_url
+
+HLS_RESOLVER = HlsResolver()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tarama telemetrisi
+- TELEMETRY → aşama başına (programlar, program sayfası, bölümler, oynatıcı sayfası,
+  yayın doğrulama, M3U yazımı ...) süre, istek sayısı, bayt, gecikme histogramı,
+  yeniden deneme, 304 ve ayrıştırma süresi.
+- İstekler, isteği yapan iş parçacığında o an açık olan en içteki aşamaya yazılır;
+  aşamalar `@instrumented("ad")` ile işaretlenen fonksiyonlardır.
+- Çalıştırma sonunda JSON rapor (makine için) ve log'a özet tablo (insan için).
+"""
+
+import os
+import time
+import json
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import List, Dict, Any, Callable, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+REPORT_NAME = "report.json"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # sn; son kova: daha uzun
+NO_STAGE = "-"  # aşama dışında yapılan istekler
+
+class _StageStats:
+    __slots__ = ("calls", "seconds", "requests", "bytes", "errors", "retries",
+                 "not_modified", "parse_seconds", "latency_total", "histogram")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.requests = 0
+        self.bytes = 0
+        self.errors = 0
+        self.retries = 0
+        self.not_modified = 0
+        self.parse_seconds = 0.0
+        self.latency_total = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def percentile(self, q: float) -> float:
+        """Histogramdan yaklaşık yüzdelik (kovanın üst sınırı)."""
+        target = q * sum(self.histogram)
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self.histogram):
+            seen += count
+            if count and seen >= target:
+                return bound
+        return 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "seconds": round(self.seconds, 3),
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "errors": self.errors,
+            "retries": self.retries,
+            "not_modified": self.not_modified,
+            "parse_seconds": round(self.parse_seconds, 3),
+            "latency_avg": round(self.latency_total / self.requests, 4) if self.requests else 0.0,
+            "latency_histogram": dict(zip([f"<={b}" for b in LATENCY_BUCKETS] + ["inf"], self.histogram)),
+        }
+
+class Telemetry:
+    """Aşama istatistikleri (thread-safe). `stage()` iç içe açılabilir; süre her aşamaya ayrı yazılır."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stages: Dict[str, _StageStats] = {}
+        self._channels: Dict[str, Dict[str, Any]] = {}
+        self._started = time.time()
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _current(self) -> _StageStats:
+        stack = self._stack()
+        name = stack[-1] if stack else NO_STAGE
+        stats = self._stages.get(name)
+        if stats is None:
+            stats = self._stages[name] = _StageStats()
+        return stats
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        stack = self._stack()
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                stats = self._stages.get(name)
+                if stats is None:
+                    stats = self._stages[name] = _StageStats()
+                stats.calls += 1
+                stats.seconds += elapsed
+
+    @contextmanager
+    def parsing(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._current().parse_seconds += elapsed
+
+    def request(self, status: int, latency: float, size: int) -> None:
+        with self._lock:
+            stats = self._current()
+            stats.requests += 1
+            stats.bytes += size
+            stats.latency_total += latency
+            if status == 304:
+                stats.not_modified += 1
+            elif status >= 400:
+                stats.errors += 1
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    stats.histogram[i] += 1
+                    break
+            else:
+                stats.histogram[-1] += 1
+
+    def retry(self) -> None:
+        with self._lock:
+            self._current().retries += 1
+
+    def channel(self, name: str, **values: Any) -> None:
+        with self._lock:
+            self._channels.setdefault(name, {}).update(values)
+
+    def report(self, path: str, caches: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """JSON raporu `path`'e yazar ve özet tabloyu log'a basar."""
+        from .m3u import _ensure_dir, _atomic_write  # net/m3u bu modülü içe aktarır: döngüsel
+        from .net import log
+
+        with self._lock:
+            stages = {name: stats.as_dict() for name, stats in sorted(self._stages.items())}
+            rows = [
+                (name, stats.calls, stats.seconds, stats.requests, stats.bytes / 1e6,
+                 stats.percentile(0.5), stats.percentile(0.95), stats.retries, stats.not_modified,
+                 stats.parse_seconds)
+                for name, stats in sorted(self._stages.items())
+            ]
+            report = {
+                "started": int(self._started),
+                "seconds": round(time.time() - self._started, 3),
+                "stages": stages,
+                "channels": dict(self._channels),
+                "caches": caches,
+            }
+        _ensure_dir(os.path.dirname(path) or ".")
+        _atomic_write(path, json.dumps(report, ensure_ascii=False, indent=1, sort_keys=True))
+
+        log.info("Çalıştırma özeti (%.1f sn) → %s", report["seconds"], path)
+        log.info("%-16s %7s %9s %7s %8s %7s %7s %6s %6s %8s",
+                 "aşama", "çağrı", "süre sn", "istek", "MB", "p50 sn", "p95 sn", "tekrar", "304", "ayrıştr")
+        for row in rows:
+            log.info("%-16s %7d %9.1f %7d %8.2f %7.2f %7.2f %6d %6d %8.2f", *row)
+        for name, values in sorted(report["channels"].items()):
+            log.info("[%s] %s", name, ", ".join(f"{key}={value}" for key, value in sorted(values.items())))
+        return report
+
+TELEMETRY = Telemetry()
+
+def instrumented(name: str) -> Callable[[F], F]:
+    """Fonksiyonu `name` aşaması olarak ölçer."""
+    def decorate(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with TELEMETRY.stage(name):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate